@@ -0,0 +1,194 @@
+import numpy as np
+
+
+class MomentAccumulator:
+    """Streaming count, mean, variance, skewness and kurtosis
+
+    Holds the count, mean and central sums M2..M4. ``update`` computes a
+    batch's own moments in two passes and folds them in, and ``merge``
+    combines two accumulators with the pairwise formulas of Chan et al.
+    and Pebay, so blocks summarized in any thread or process combine to
+    the moments of the concatenated data without revisiting it. Memory
+    is constant.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_ = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+
+    def __repr__(self):
+        return f"MomentAccumulator(count={self.count}, mean={self.mean:.6g}, std={self.std():.6g})"
+
+    def update(self, values):
+        """Add the finite entries of ``values`` (any shape)"""
+        x = np.asarray(values, dtype=float).ravel()
+        if not np.isfinite(x).all():
+            x = x[np.isfinite(x)]
+        if x.size == 0:
+            return self
+        batch = MomentAccumulator()
+        batch.count = x.size
+        batch.mean_ = x.mean()
+        d = x - batch.mean_
+        d2 = d * d
+        batch._m2 = d2.sum()
+        batch._m3 = d2 @ d
+        batch._m4 = d2 @ d2
+        return self.merge(batch)
+
+    def merge(self, other):
+        """Fold ``other`` into this accumulator in place"""
+        n_a, n_b = self.count, other.count
+        if n_b == 0:
+            return self
+        if n_a == 0:
+            self.count, self.mean_ = other.count, other.mean_
+            self._m2, self._m3, self._m4 = other._m2, other._m3, other._m4
+            return self
+        n = n_a + n_b
+        delta = other.mean_ - self.mean_
+        d_n = delta / n
+        m2_a, m3_a = self._m2, self._m3
+        self._m4 += (other._m4 + delta * d_n**3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+                     + 6 * d_n**2 * (n_a * n_a * other._m2 + n_b * n_b * m2_a)
+                     + 4 * d_n * (n_a * other._m3 - n_b * m3_a))
+        self._m3 += (other._m3 + delta * d_n**2 * n_a * n_b * (n_a - n_b)
+                     + 3 * d_n * (n_a * other._m2 - n_b * m2_a))
+        self._m2 += other._m2 + delta * d_n * n_a * n_b
+        self.mean_ += d_n * n_b
+        self.count = n
+        return self
+
+    @property
+    def mean(self):
+        return self.mean_ if self.count else np.nan
+
+    def var(self, ddof=0):
+        return self._m2 / (self.count - ddof) if self.count > ddof else np.nan
+
+    def std(self, ddof=0):
+        return np.sqrt(self.var(ddof))
+
+    @property
+    def skewness(self):
+        if self.count == 0 or self._m2 == 0:
+            return np.nan
+        return np.sqrt(self.count) * self._m3 / self._m2**1.5
+
+    @property
+    def kurtosis(self):
+        """Excess kurtosis"""
+        if self.count == 0 or self._m2 == 0:
+            return np.nan
+        return self.count * self._m4 / self._m2**2 - 3
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch (KLL)
+
+    Values sit in levels of compactors, an item at level h standing for
+    2**h inputs. A level over its capacity is sorted and every other item
+    (random offset) moves up a level, which keeps the total weight equal
+    to the count. Capacities shrink geometrically (factor 2/3) below the
+    top level, so the sketch holds about 3k items. Rank error is of order
+    1/k, i.e. well under 1% of the count for the default k. Sketches
+    merge by pooling levels and compacting, in any order or process;
+    ``seed`` fixes the compaction offsets so results are reproducible.
+    """
+
+    def __init__(self, k=256, seed=0):
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __repr__(self):
+        return f"QuantileSketch(k={self.k}, count={self.count}, retained={self.size})"
+
+    @property
+    def size(self):
+        """Number of items retained"""
+        return sum(len(level) for level in self._levels)
+
+    def _capacities(self):
+        top = len(self._levels) - 1
+        return [max(2, int(np.ceil(self.k * (2 / 3)**(top - h)))) for h in range(top + 1)]
+
+    def _compress(self):
+        capacities = self._capacities()
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) > capacities[h]:
+                level = np.sort(level)
+                even = len(level) - len(level) % 2
+                promoted = level[self._rng.integers(2):even:2]
+                self._levels[h] = level[even:]
+                if h + 1 == len(self._levels):
+                    # A new top level shrinks the capacities below it; start over
+                    self._levels.append(promoted)
+                    capacities = self._capacities()
+                    h = 0
+                    continue
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            h += 1
+
+    def update(self, values):
+        """Add the finite entries of ``values`` (any shape)"""
+        x = np.asarray(values, dtype=float).ravel()
+        if not np.isfinite(x).all():
+            x = x[np.isfinite(x)]
+        if x.size == 0:
+            return self
+        self.count += x.size
+        self.min = min(self.min, x.min())
+        self.max = max(self.max, x.max())
+        self._levels[0] = np.concatenate([self._levels[0], x])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch in place"""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0**h) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Approximate q-quantiles (q in [0, 1], scalar or array)"""
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)[()]
+        items, cumulative = self._weighted()
+        idx = np.searchsorted(cumulative, q * self.count, side="left")
+        out = items[np.clip(idx, 0, len(items) - 1)]
+        out = np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+        return out[()] if out.ndim == 0 else out
+
+    def cdf(self, x):
+        """Approximate fraction of values <= x"""
+        x = np.asarray(x, dtype=float)
+        if self.count == 0:
+            return np.full(x.shape, np.nan)[()]
+        items, cumulative = self._weighted()
+        idx = np.searchsorted(items, x, side="right")
+        out = np.where(idx > 0, cumulative[np.maximum(idx - 1, 0)], 0.0) / self.count
+        return out[()] if out.ndim == 0 else out
@@ -2,7 +2,6 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from scipy.integrate import trapezoid
 import io
 import base64
 from datetime import datetime
@@ -10,11 +9,15 @@ from datetime import datetime
 # Import from local modules
 from distributions import (
     weibull_pdf, weibull_cdf, weibull_sf, weibull_hazard,
-    stiiHLW_pdf, stiiHLW_cdf, stiiHLW_sf, stiiHLW_hazard,
-    mle_stiiHLW, goodness_of_fit, generate_stiiHLW_samples,
-    stiiHLW_quantile
+    stiiHLW_pdf,
+    mle_stiiHLW, fit_stiiHLW, goodness_of_fit, generate_stiiHLW_samples,
+    frequency_table,
+    stiiHLW_quantile, STIIHLW, weibull_stats
 )
 
+from fitting import bootstrap_stiiHLW
+from simulation import SAMPLING_METHODS, simulate_stiiHLW
+from tables import stiiHLW_summary
 from plots import plot_curve, plot_comparison, plot_histogram_with_fit, plot_qq
 
 # =============================
@@ -549,6 +552,7 @@ elif page == "📊 Distribution Explorer":
     
     # Compute x values
     x = np.linspace(max(0.001, x_range_min), x_range_max, 1000)
+    dist = STIIHLW(lam, k, alpha)
     
     # Compute distributions
     if dist_choice == "Base Weibull":
@@ -559,10 +563,8 @@ elif page == "📊 Distribution Explorer":
         dist_name = "Base Weibull"
         badge_class = "weibull-badge"
     elif dist_choice == "STIIHL Weibull":
-        pdf = stiiHLW_pdf(x, lam, k, alpha)
-        cdf = stiiHLW_cdf(x, lam, k, alpha)
-        sf = stiiHLW_sf(x, lam, k, alpha)
-        hz = stiiHLW_hazard(x, lam, k, alpha)
+        funcs = dist.eval(x, ("pdf", "cdf", "sf", "hazard"))
+        pdf, cdf, sf, hz = funcs["pdf"], funcs["cdf"], funcs["sf"], funcs["hazard"]
         dist_name = "STIIHL Weibull"
         badge_class = "stiihl-badge"
     else:  # Comparison
@@ -571,10 +573,9 @@ elif page == "📊 Distribution Explorer":
         sf_base = weibull_sf(x, lam, k)
         hz_base = weibull_hazard(x, lam, k)
         
-        pdf_stiihl = stiiHLW_pdf(x, lam, k, alpha)
-        cdf_stiihl = stiiHLW_cdf(x, lam, k, alpha)
-        sf_stiihl = stiiHLW_sf(x, lam, k, alpha)
-        hz_stiihl = stiiHLW_hazard(x, lam, k, alpha)
+        funcs = dist.eval(x, ("pdf", "cdf", "sf", "hazard"))
+        pdf_stiihl, cdf_stiihl = funcs["pdf"], funcs["cdf"]
+        sf_stiihl, hz_stiihl = funcs["sf"], funcs["hazard"]
         dist_name = "Distribution Comparison"
         badge_class = "weibull-badge"
     
@@ -590,11 +591,13 @@ elif page == "📊 Distribution Explorer":
     # Summary Statistics
     if dist_choice != "Comparison":
         try:
-            mean_val = trapezoid(x * pdf, x)
-            var_val = trapezoid((x - mean_val)**2 * pdf, x)
+            if dist_choice == "Base Weibull":
+                moments = weibull_stats(lam, k)
+            else:
+                moments = stiiHLW_summary(lam, k, alpha)
+            mean_val, var_val = moments["mean"], moments["variance"]
             std_val = np.sqrt(var_val)
-            skewness = trapezoid(((x - mean_val)/std_val)**3 * pdf, x)
-            kurtosis = trapezoid(((x - mean_val)/std_val)**4 * pdf, x) - 3
+            skewness, kurtosis = moments["skewness"], moments["kurtosis"]
             
             st.markdown("<h4>📈 Distribution Moments</h4>", unsafe_allow_html=True)
             
@@ -610,6 +613,15 @@ elif page == "📊 Distribution Explorer":
                 st.metric("Skewness", f"{skewness:.4f}")
             with col5:
                 st.metric("Kurtosis", f"{kurtosis:.4f}")
+            
+            if dist_choice == "STIIHL Weibull":
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Median", f"{moments['median']:.4f}")
+                with col2:
+                    st.metric("Mode", f"{moments['mode']:.4f}")
+                with col3:
+                    st.metric("Hazard Shape", moments["hazard_shape"].title())
         except:
             st.warning("Could not calculate moments for this parameter combination.")
     
@@ -713,7 +725,7 @@ elif page == "📊 Distribution Explorer":
             # Quantile analysis
             p_values = np.linspace(0.01, 0.99, 50)
             if dist_choice == "STIIHL Weibull":
-                quantiles = np.array([stiiHLW_quantile(p, lam, k, alpha) for p in p_values])
+                quantiles = dist.ppf(p_values)
             else:
                 quantiles = lam * (-np.log(1-p_values))**(1/k)
             
@@ -751,7 +763,7 @@ elif page == "📊 Distribution Explorer":
                 if i < 4:
                     with [col1, col2, col3, col4][i]:
                         if dist_choice == "STIIHL Weibull":
-                            q = stiiHLW_quantile(p, lam, k, alpha)
+                            q = dist.ppf(p)
                         else:
                             q = lam * (-np.log(1-p))**(1/k)
                         if not np.isnan(q):
@@ -933,7 +945,12 @@ elif page == "🔬 Statistical Analysis":
                 
                 # Assume first column contains data
                 if len(df.columns) > 0:
-                    data = df.iloc[:, 0].dropna().values
+                    data = df.iloc[:, 0].dropna().values.astype(float)
+                    # The distribution lives on (0, inf); zeros (e.g. from rounding) cannot be fitted
+                    if np.any(data <= 0):
+                        st.warning(f"⚠️ Dropped {np.count_nonzero(data <= 0)} non-positive values "
+                                   "outside the support of the distribution")
+                        data = data[data > 0]
                     st.session_state.uploaded_data = data
                     st.success(f"✅ Successfully loaded {len(data)} data points")
                     
@@ -1056,10 +1073,9 @@ elif page == "🔬 Statistical Analysis":
         
         with col2:
             # Q-Q Plot
-            theoretical_quantiles = np.array([
-                stiiHLW_quantile((i+1)/(len(data)+1), lam_mle, k_mle, alpha_mle) 
-                for i in range(len(data))
-            ])
+            theoretical_quantiles = stiiHLW_quantile(
+                np.arange(1, len(data)+1) / (len(data)+1), lam_mle, k_mle, alpha_mle
+            )
             
             fig_qq = plot_qq(
                 np.sort(data),
@@ -1071,31 +1087,50 @@ elif page == "🔬 Statistical Analysis":
         # Confidence Intervals (Bootstrap)
         if analysis_type in ["Confidence Intervals", "Complete Analysis Suite"]:
             st.markdown("<div class='analysis-card'>", unsafe_allow_html=True)
-            st.markdown("##### 📐 Bootstrap Confidence Intervals")
-            
-            n_bootstrap = st.slider("Bootstrap Samples", 100, 5000, 1000, key="bootstrap_n")
-            
-            if st.button("🔄 Compute Bootstrap CIs", use_container_width=True, key="bootstrap_btn"):
-                with st.spinner(f"Running {n_bootstrap} bootstrap samples..."):
-                    bootstrap_params = []
-                    for _ in range(n_bootstrap):
-                        # Resample with replacement
-                        bootstrap_sample = np.random.choice(data, size=len(data), replace=True)
-                        params = mle_stiiHLW(bootstrap_sample)
-                        bootstrap_params.append(params)
-                    
-                    bootstrap_params = np.array(bootstrap_params)
+            st.markdown("##### 📐 Confidence Intervals")
+            
+            ci_method = st.radio(
+                "Interval Method",
+                ["Observed Information (log-scale Wald)", "Observed Information (Wald)", "Bootstrap"],
+                horizontal=True,
+                key="ci_method",
+                help="Wald intervals use the analytic Hessian at the MLE; bootstrap refits resampled data"
+            )
+            
+            show_ci = False
+            
+            if ci_method == "Bootstrap":
+                n_bootstrap = st.slider("Bootstrap Samples", 100, 5000, 1000, key="bootstrap_n")
+                
+                if st.button("🔄 Compute Bootstrap CIs", use_container_width=True, key="bootstrap_btn"):
+                    progress_bar = st.progress(0.0, text=f"Running {n_bootstrap} bootstrap samples...")
                     
-                    # Compute percentiles
-                    ci_level = 0.95
-                    alpha_ci = 1 - ci_level
-                    lower_percentile = alpha_ci/2 * 100
-                    upper_percentile = (1 - alpha_ci/2) * 100
+                    # Parallel resampling, warm-started from the full-sample MLE
+                    boot = bootstrap_stiiHLW(
+                        data, n_boot=n_bootstrap,
+                        progress=lambda done, total: progress_bar.progress(done/total)
+                    )
+                    progress_bar.empty()
                     
-                    ci_lam = np.percentile(bootstrap_params[:, 0], [lower_percentile, upper_percentile])
-                    ci_k = np.percentile(bootstrap_params[:, 1], [lower_percentile, upper_percentile])
-                    ci_alpha = np.percentile(bootstrap_params[:, 2], [lower_percentile, upper_percentile])
+                    ci_lam, ci_k, ci_alpha = boot.percentile_intervals(0.95)
+                    show_ci = True
+            
+            else:
+                fit = fit_stiiHLW(data)
+                scale = 'log' if ci_method.startswith("Observed Information (log") else 'linear'
+                ci_lam, ci_k, ci_alpha = fit.confidence_intervals(0.95, scale=scale)
+                se_lam, se_k, se_alpha = fit.standard_errors
+                show_ci = True
                 
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("SE(λ)", f"{se_lam:.4f}")
+                with col2:
+                    st.metric("SE(k)", f"{se_k:.4f}")
+                with col3:
+                    st.metric("SE(α)", f"{se_alpha:.4f}")
+            
+            if show_ci:
                 # Display CIs
                 st.markdown(f"""
                 <div style='background: rgba(30, 30, 30, 0.6); padding: 20px; border-radius: 12px; margin: 15px 0;'>
@@ -1152,8 +1187,8 @@ elif page == "🔬 Statistical Analysis":
             
             DISTRIBUTION PROPERTIES
             ------------------------
-            Mean (fitted): {trapezoid(x_range * fitted_pdf, x_range):.4f}
-            Variance (fitted): {trapezoid((x_range - trapezoid(x_range * fitted_pdf, x_range))**2 * fitted_pdf, x_range):.4f}
+            Mean (fitted): {STIIHLW(lam_mle, k_mle, alpha_mle).mean():.4f}
+            Variance (fitted): {STIIHLW(lam_mle, k_mle, alpha_mle).var():.4f}
             
             """
             
@@ -1204,7 +1239,12 @@ elif page == "📈 Data Fitting":
             
             # Assume first column is data
             if len(df.columns) > 0:
-                data = df.iloc[:, 0].dropna().values
+                data = df.iloc[:, 0].dropna().values.astype(float)
+                # The distribution lives on (0, inf); zeros (e.g. from rounding) cannot be fitted
+                if np.any(data <= 0):
+                    st.warning(f"⚠️ Dropped {np.count_nonzero(data <= 0)} non-positive values "
+                               "outside the support of the distribution")
+                    data = data[data > 0]
                 
                 if len(data) > 0:
                     st.success(f"✅ Successfully loaded {len(data)} data points")
@@ -1245,8 +1285,11 @@ elif page == "📈 Data Fitting":
                     
                     # Fit STIIHL Weibull
                     with st.spinner("Fitting STIIHL Weibull distribution..."):
-                        lam_fit, k_fit, alpha_fit = mle_stiiHLW(data)
-                        gof_results = goodness_of_fit(data, lam_fit, k_fit, alpha_fit)
+                        # Fit on distinct values with counts; identical result, cheaper with ties
+                        values, counts = frequency_table(data)
+                        lam_fit, k_fit, alpha_fit = mle_stiiHLW(values, weights=counts)
+                        fitted = STIIHLW(lam_fit, k_fit, alpha_fit)
+                        gof_results = goodness_of_fit(values, lam_fit, k_fit, alpha_fit, weights=counts)
                     
                     # Display fitted parameters
                     col1, col2, col3 = st.columns(3)
@@ -1281,10 +1324,10 @@ elif page == "📈 Data Fitting":
                         
                         # Calculate moments
                         x_range = np.linspace(0, np.max(data)*1.5, 1000)
-                        fitted_pdf = stiiHLW_pdf(x_range, lam_fit, k_fit, alpha_fit)
+                        fitted_pdf = fitted.pdf(x_range)
                         
-                        mean_fit = trapezoid(x_range * fitted_pdf, x_range)
-                        var_fit = trapezoid((x_range - mean_fit)**2 * fitted_pdf, x_range)
+                        mean_fit = fitted.mean()
+                        var_fit = fitted.var()
                         
                         st.markdown(f"""
                         <div style='color: #f5c77a;'>
@@ -1308,10 +1351,7 @@ elif page == "📈 Data Fitting":
                         st.plotly_chart(fig_hist, use_container_width=True)
                     
                     with tab2:
-                        theoretical_quantiles = np.array([
-                            stiiHLW_quantile((i+1)/(len(data)+1), lam_fit, k_fit, alpha_fit)
-                            for i in range(len(data))
-                        ])
+                        theoretical_quantiles = fitted.ppf(np.arange(1, len(data)+1) / (len(data)+1))
                         
                         fig_qq = plot_qq(
                             np.sort(data),
@@ -1326,7 +1366,7 @@ elif page == "📈 Data Fitting":
                         ecdf = np.arange(1, len(data)+1) / len(data)
                         
                         # Theoretical CDF
-                        tcdf = stiiHLW_cdf(sorted_data, lam_fit, k_fit, alpha_fit)
+                        tcdf = fitted.cdf(sorted_data)
                         
                         fig_cdf = go.Figure()
                         
@@ -1383,7 +1423,7 @@ elif page == "📈 Data Fitting":
                         # Generate prediction
                         st.markdown("##### 🔮 Make Predictions")
                         percentile = st.slider("Percentile", 0.01, 0.99, 0.95, 0.01, key="pred_percentile")
-                        predicted_value = stiiHLW_quantile(percentile, lam_fit, k_fit, alpha_fit)
+                        predicted_value = fitted.ppf(percentile)
                         st.metric(f"{int(percentile*100)}th Percentile", f"{predicted_value:.4f}")
                 
                 else:
@@ -1428,12 +1468,27 @@ elif page == "🧪 Monte Carlo Simulation":
     with col4:
         n_simulations = st.number_input("Simulations", 100, 100000, 1000, 100, key="n_simulations")
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         n_samples = st.number_input("Samples per Simulation", 10, 10000, 100, 10, key="n_samples_per_sim")
     
     with col2:
+        sim_seed = st.number_input("Random Seed", 0, 2**31 - 1, 42, 1, key="sim_seed",
+                                   help="Same seed, same results, whatever the number of cores")
+    
+    with col3:
+        sampling = st.selectbox(
+            "Variance Reduction",
+            SAMPLING_METHODS,
+            format_func=lambda m: {"standard": "None (i.i.d.)", "antithetic": "Antithetic",
+                                   "sobol": "Sobol (RQMC)", "halton": "Halton (RQMC)",
+                                   "control": "Control Variates"}[m],
+            key="sim_sampling",
+            help="Variance-reduction factors against plain Monte Carlo are reported with the results"
+        )
+    
+    with col4:
         simulation_type = st.selectbox(
             "Simulation Type",
             ["Risk Assessment", "Reliability Analysis", "Parameter Uncertainty", "Custom"],
@@ -1442,49 +1497,52 @@ elif page == "🧪 Monte Carlo Simulation":
     
     # Run Simulation
     if st.button("🚀 Run Monte Carlo Simulation", use_container_width=True, key="run_sim_btn"):
-        with st.spinner(f"Running {n_simulations} Monte Carlo simulations..."):
-            # Generate simulations
-            simulations = []
-            for _ in range(n_simulations):
-                samples = generate_stiiHLW_samples(n_samples, sim_lam, sim_k, sim_alpha)
-                simulations.append(samples)
-            
-            simulations = np.array(simulations)
-            
-            # Calculate statistics
-            means = np.mean(simulations, axis=1)
-            stds = np.std(simulations, axis=1)
-            percentiles = np.percentile(simulations, [5, 25, 50, 75, 95], axis=1)
-            
-            # Store results
-            st.session_state.sim_results = {
-                'simulations': simulations,
-                'means': means,
-                'stds': stds,
-                'percentiles': percentiles
-            }
-            
-            st.success(f"✅ Completed {n_simulations} simulations")
+        progress_bar = st.progress(0.0, text=f"Running {n_simulations} Monte Carlo simulations...")
+        
+        # Blocks run across all cores and are reduced to accumulators in
+        # their workers; only the raw draws shown as traces come back. The
+        # exceedance of every threshold the Risk tab slider can reach is
+        # tabulated in the same pass, so moving the slider is a lookup.
+        st.session_state.sim_results = simulate_stiiHLW(
+            sim_lam, sim_k, sim_alpha, int(n_simulations), int(n_samples),
+            thresholds=np.linspace(0.0, 20.0, 201), retain=min(100, int(n_simulations)),
+            seed=int(sim_seed), keep_replicates=False, n_workers=None, sampling=sampling,
+            progress=lambda done, total: progress_bar.progress(done/total)
+        )
+        st.session_state.sim_risk = st.session_state.sim_results.risk_curve(0.95)
+        st.session_state.sim_vr = st.session_state.sim_results.variance_reduction()
+        progress_bar.empty()
+        
+        st.success(f"✅ Completed {n_simulations} simulations")
     
     # Display Results
     if 'sim_results' in st.session_state:
         st.markdown("<h4>📊 Simulation Results</h4>", unsafe_allow_html=True)
         
-        # Summary Statistics
+        # Summary statistics come from the accumulators filled during the
+        # run, not from passes over the per-replicate arrays
+        sim_stats = st.session_state.sim_results.stats
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Mean of Means", f"{np.mean(st.session_state.sim_results['means']):.4f}")
+            st.metric("Mean of Means", f"{sim_stats.means.mean:.4f}")
         
         with col2:
-            st.metric("Std of Means", f"{np.std(st.session_state.sim_results['means']):.4f}")
+            st.metric("Std of Means", f"{sim_stats.means.std():.4f}")
         
         with col3:
-            st.metric("Mean Std Dev", f"{np.mean(st.session_state.sim_results['stds']):.4f}")
+            st.metric("Mean Std Dev", f"{sim_stats.stds.mean:.4f}")
         
         with col4:
-            st.metric("95% CI Width", 
-                     f"{np.percentile(st.session_state.sim_results['means'], 97.5) - np.percentile(st.session_state.sim_results['means'], 2.5):.4f}")
+            ci_low, ci_high = sim_stats.mean_quantiles.quantile([0.025, 0.975])
+            st.metric("95% CI Width", f"{ci_high - ci_low:.4f}")
+        
+        vr_mean = st.session_state.sim_vr['mean']
+        vr_text = f"{vr_mean:.1f}×" if np.isfinite(vr_mean) else "—"
+        st.caption(f"Sampling: {st.session_state.sim_results.sampling}. Variance reduction of the "
+                   f"mean vs. plain Monte Carlo: {vr_text} "
+                   f"(the same CI width with that many times fewer draws)")
         
         # Visualizations
         tab1, tab2, tab3 = st.tabs(["Distribution of Means", "Simulation Traces", "Risk Assessment"])
@@ -1493,8 +1551,9 @@ elif page == "🧪 Monte Carlo Simulation":
             # Histogram of means
             fig_means = go.Figure()
             
+            # Evenly spaced quantiles of the sketch stand in for the replicates
             fig_means.add_trace(go.Histogram(
-                x=st.session_state.sim_results['means'],
+                x=sim_stats.mean_quantiles.quantile(np.linspace(0.0025, 0.9975, 400)),
                 nbinsx=30,
                 marker_color='rgba(245, 199, 122, 0.6)',
                 marker_line=dict(color='#f5c77a', width=1),
@@ -1519,11 +1578,12 @@ elif page == "🧪 Monte Carlo Simulation":
             # Plot first 100 simulation traces
             fig_traces = go.Figure()
             
-            n_traces = min(100, n_simulations)
+            traces = st.session_state.sim_results.traces
+            n_traces = len(traces)
             for i in range(n_traces):
                 fig_traces.add_trace(go.Scatter(
-                    x=np.arange(n_samples),
-                    y=st.session_state.sim_results['simulations'][i],
+                    x=np.arange(traces.shape[1]),
+                    y=traces[i],
                     mode='lines',
                     line=dict(width=1, color=f'rgba(245, 199, 122, {0.05 + 0.95*i/n_traces})'),
                     showlegend=False
@@ -1547,30 +1607,77 @@ elif page == "🧪 Monte Carlo Simulation":
             # Risk assessment: probability of exceeding threshold
             st.markdown("##### ⚠️ Risk Assessment")
             
+            # The risk curve was tabulated during the run; the slider only looks it up
+            risk = st.session_state.sim_risk
             threshold = st.slider("Threshold Value", 0.0, 20.0, 5.0, 0.1, key="risk_threshold")
+            risk_point = risk.at(threshold)
             
-            # Calculate exceedance probability
-            exceedance_probs = []
-            for sim in st.session_state.sim_results['simulations']:
-                exceedance_prob = np.mean(sim > threshold)
-                exceedance_probs.append(exceedance_prob)
-            
-            exceedance_probs = np.array(exceedance_probs)
-            
-            col1, col2 = st.columns(2)
+            col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Mean Exceedance Probability", f"{np.mean(exceedance_probs):.4%}")
+                st.metric("Mean Exceedance Probability", f"{risk_point['mean']:.4%}")
             
             with col2:
-                st.metric("95% CI", 
-                         f"[{np.percentile(exceedance_probs, 2.5):.4%}, {np.percentile(exceedance_probs, 97.5):.4%}]")
+                st.metric("Exact P(X > t)", f"{risk_point['exact']:.4%}")
+            
+            with col3:
+                st.metric("95% CI", f"[{risk_point['lower']:.4%}, {risk_point['upper']:.4%}]")
+            
+            with col4:
+                # The simulated grid is increasing, so it lines up with the curve;
+                # the factor is undefined where every or no replicate exceeds
+                vr = st.session_state.sim_vr['exceedance'][risk.index(threshold)]
+                st.metric("Variance Reduction", f"{vr:.1f}×" if np.isfinite(vr) else "—")
+            
+            # Risk curve: simulated band and mean against the exact survival function
+            fig_curve = go.Figure()
+            
+            fig_curve.add_trace(go.Scatter(
+                x=np.concatenate([risk.thresholds, risk.thresholds[::-1]]),
+                y=np.concatenate([risk.upper, risk.lower[::-1]]),
+                fill='toself',
+                fillcolor='rgba(239, 68, 68, 0.2)',
+                line=dict(width=0),
+                name='95% of Replicates'
+            ))
+            
+            fig_curve.add_trace(go.Scatter(
+                x=risk.thresholds,
+                y=risk.mean,
+                mode='lines',
+                line=dict(color='#ef4444', width=2),
+                name='Simulated'
+            ))
+            
+            fig_curve.add_trace(go.Scatter(
+                x=risk.thresholds,
+                y=risk.exact,
+                mode='lines',
+                line=dict(color='#f5c77a', width=2, dash='dash'),
+                name='Exact (stiiHLW_sf)'
+            ))
+            
+            fig_curve.add_vline(x=risk_point['threshold'], line_dash="dot", line_color="#ffd98e")
             
-            # Exceedance probability distribution
+            fig_curve.update_layout(
+                title="Exceedance Probability by Threshold",
+                xaxis_title='Threshold',
+                yaxis_title='P(X > Threshold)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#f5c77a'),
+                xaxis=dict(gridcolor='rgba(245, 199, 122, 0.1)'),
+                yaxis=dict(gridcolor='rgba(245, 199, 122, 0.1)'),
+                height=400
+            )
+            
+            st.plotly_chart(fig_curve, use_container_width=True)
+            
+            # Exceedance probability distribution, from the threshold's sketch
             fig_risk = go.Figure()
             
             fig_risk.add_trace(go.Histogram(
-                x=exceedance_probs,
+                x=risk.quantiles[risk.index(threshold)].quantile(np.linspace(0.0025, 0.9975, 400)),
                 nbinsx=30,
                 marker_color='rgba(239, 68, 68, 0.6)',
                 marker_line=dict(color='#ef4444', width=1),
@@ -1578,7 +1685,7 @@ elif page == "🧪 Monte Carlo Simulation":
             ))
             
             fig_risk.update_layout(
-                title=f"Distribution of Exceedance Probability (Threshold = {threshold})",
+                title=f"Distribution of Exceedance Probability (Threshold = {risk_point['threshold']:g})",
                 xaxis_title='Exceedance Probability',
                 yaxis_title='Frequency',
                 plot_bgcolor='rgba(0,0,0,0)',
@@ -1599,15 +1706,13 @@ elif page == "🧪 Monte Carlo Simulation":
             summary_df = pd.DataFrame({
                 'Statistic': ['Mean_of_Means', 'Std_of_Means', 'Mean_Std_Dev', 
                              '5th_Percentile', 'Median', '95th_Percentile',
-                             'Exceedance_Probability_Mean'],
+                             f'Exceedance_Probability_Mean_{st.session_state.risk_threshold:g}'],
                 'Value': [
-                    np.mean(st.session_state.sim_results['means']),
-                    np.std(st.session_state.sim_results['means']),
-                    np.mean(st.session_state.sim_results['stds']),
-                    np.percentile(st.session_state.sim_results['means'], 5),
-                    np.percentile(st.session_state.sim_results['means'], 50),
-                    np.percentile(st.session_state.sim_results['means'], 95),
-                    np.mean(exceedance_probs) if 'exceedance_probs' in locals() else np.nan
+                    sim_stats.means.mean,
+                    sim_stats.means.std(),
+                    sim_stats.stds.mean,
+                    *sim_stats.mean_quantiles.quantile([0.05, 0.5, 0.95]),
+                    st.session_state.sim_risk.at(st.session_state.risk_threshold)['mean']
                 ]
             })
             
@@ -1691,9 +1796,7 @@ elif page == "📚 Documentation":
         print(f"Reliability at {t} hours: {reliability:.4f}")
         
         # Mean Time To Failure (MTTF)
-        x = np.linspace(0, max(failure_times)*2, 1000)
-        pdf = stiiHLW_pdf(x, *params)
-        mttf = trapezoid(x * pdf, x)
+        mttf = STIIHLW(*params).mean()
         ```
         
         ### 2. Financial Risk Modeling
@@ -1787,46 +1890,310 @@ elif page == "📚 Documentation":
         
         ---
         
+        #### `stiiHLW_logpdf`, `stiiHLW_logcdf`, `stiiHLW_logsf` `(x, lam, k, alpha)`
+        Log-density, log-CDF and log-survival computed directly in log space.
+        
+        **Parameters:** Same as `stiiHLW_pdf`
+        **Returns:** Log-function values (finite far into both tails)
+        
+        ---
+        
+        #### `stiiHLW_eval(x, lam, k, alpha, which)`
+        Evaluate several functions in one pass over shared intermediates.
+        
+        **Parameters:**
+        - `x`, `lam`, `k`, `alpha`: as for `stiiHLW_pdf`
+        - `which`: names from `("pdf", "cdf", "sf", "hazard", "cumhazard", "logpdf", "logcdf", "logsf")`
+        
+        **Returns:** Dictionary of the requested function values
+        
+        ---
+        
         #### `stiiHLW_quantile(p, lam, k, alpha)`
         Calculate quantile function (inverse CDF).
         
         **Parameters:**
-        - `p`: float, probability value (0 < p < 1)
-        - `lam`, `k`, `alpha`: distribution parameters
+        - `p`: array-like, probability values in [0, 1]
+        - `lam`, `k`, `alpha`: distribution parameters (broadcast against `p`)
+        
+        **Returns:** Quantile values (closed form; p=0 gives 0, p=1 gives inf)
+        
+        ---
+        
+        #### `STIIHLW(lam, k, alpha)`
+        Frozen distribution with the `scipy.stats` frozen-distribution interface.
+        
+        **Methods:** `pdf`, `logpdf`, `cdf`, `logcdf`, `sf`, `logsf`, `hazard`,
+        `cumhazard`, `eval`, `ppf`, `isf`, `rvs`, `stats(moments='mv')`, `moment(n)`,
+        `mean`, `var`, `std`, `median`, `interval(confidence)`,
+        `expect(func, lb, ub, conditional)`, `entropy`, `support`
+        
+        All use the closed-form kernels. Moments, median and entropy are
+        memoized per instance.
+        
+        `ppf(q, tol)`, `cdf(x, tol)` and `rvs(size, random_state, tol)` evaluate through a cached
+        monotone piecewise-polynomial interpolant with relative error ≤ `tol`, 2-3x faster
+        for bulk evaluation (worthwhile from about 10^6 points).
+        
+        ---
+        
+        #### `stiiHLW_isf(q, lam, k, alpha)`
+        Inverse survival function, accurate for upper-tail probabilities far below machine epsilon.
+        
+        ---
+        
+        #### `stiiHLW_moments(lam, k, alpha, orders=(1, 2, 3, 4))`
+        Raw moments E[X^r] by Gauss–Legendre quadrature over the quantile function.
+        
+        **Returns:** Tuple (moments, errors); `errors` estimates the absolute quadrature error.
+        Results for a given shape (k, alpha) are cached and rescaled by lam^r.
+        
+        ---
+        
+        #### `stiiHLW_summary(lam, k, alpha)`
+        Mean, variance, std, skewness, excess kurtosis, median, mode and hazard shape,
+        interpolated from the precomputed (k, α) table `stiihlw_table.npz` (module `tables`).
+        
+        λ is a pure scale, so the table covers k, α ∈ [0.1, 20] only; outside it, and across
+        mode or hazard-shape boundaries, values are computed exactly. Rebuild with `python tables.py`.
+        
+        **Returns:** Dictionary of summaries; `hazard_shape` is one of `HAZARD_SHAPES`
         
-        **Returns:** Quantile value
+        ---
+        
+        #### `stiiHLW_mode(lam, k, alpha)` / `stiiHLW_hazard_shape(k, alpha)`
+        Exact mode of the density (0 when it peaks at the origin) and shape of the hazard rate.
+        
+        ---
+        
+        #### `stiiHLW_stats(lam, k, alpha)` / `weibull_stats(lam, k)`
+        Mean, variance, std, skewness and excess kurtosis of the STIIHL Weibull and base Weibull.
+        
+        **Returns:** Dictionary of summary moments
         
         ---
         
-        #### `mle_stiiHLW(data)`
+        #### `mle_stiiHLW(data, method='L-BFGS-B', x0=None, weights=None, bins=None)`
         Maximum Likelihood Estimation for STIIHL Weibull.
         
         **Parameters:**
         - `data`: array-like, observed data
+        - `method`: `'L-BFGS-B'` (analytic score) or `'trust-constr'` (analytic score and Hessian)
+        - `x0`: optional starting `(lam, k, alpha)`; defaults to `stiiHLW_initial_guess`
+        - `weights`: optional frequency counts for the values in `data`
+        - `bins`: optional `(edges, counts)` of pre-binned data, fitted by the interval likelihood
+        - `censoring`, `upper`: optional censoring codes per value and right ends of interval-censored values
         
         **Returns:** Tuple (lam, k, alpha) of estimated parameters
         
         ---
         
-        #### `goodness_of_fit(data, lam, k, alpha)`
+        #### `fit_stiiHLW(data, method='L-BFGS-B')`
+        Maximum likelihood fit with observed-information inference.
+        
+        The data are rescaled by the starting `lam` and the search runs over
+        unconstrained log-parameters, so iterations and estimates do not
+        depend on the units of the data. Exact observations must be positive and finite
+        (`ValueError` otherwise); a fit that cannot start reports `success=False`.
+        
+        **Returns:** `FitResult` with `params`, `loglik`, `information`, `covariance`,
+        `standard_errors` and `confidence_intervals(level=0.95, scale='log')`;
+        unpacks like `(lam, k, alpha)`
+        
+        ---
+        
+        #### `stiiHLW_initial_guess(data=None, weights=None, bins=None)`
+        Data-driven starting `(lam, k, alpha)` for the likelihood fit.
+        
+        Profiles `alpha` by the correlation of the Weibull probability plot
+        after inverting the sine and TIIHL transforms, takes `k` from its slope
+        and matches `lam` to the central quantiles.
+        
+        ---
+        
+        #### `bootstrap_stiiHLW(data, n_boot=1000, seed=None, n_workers=None, ...)`
+        Parallel nonparametric bootstrap of the MLE (module `fitting`).
+        
+        **Parameters:**
+        - `data`: array-like, observed data (shared with workers once)
+        - `n_boot`: int, number of replicates
+        - `seed`: seed for the spawned per-chunk `SeedSequence` streams
+        - `n_workers`: process count (defaults to all cores; 1 runs in-process)
+        - `progress`, `cancel`: optional callbacks `progress(done, total)` and `cancel() -> bool`
+        
+        **Returns:** `BootstrapResult` with `replicates`, `percentile_intervals(level)`, `standard_errors`
+        
+        ---
+        
+        #### `fit_stiiHLW_multistart(data, n_starts=16, seed=None, n_workers=None, agree=3)`
+        Multi-start MLE across a process pool (module `fitting`).
+        
+        Runs local fits from the data-driven start and a Latin-hypercube set of
+        starts around it, and stops once `agree` fits reach the best optimum.
+        `details` lists every local optimum found with its log-likelihood and
+        the number of starts that reached it.
+        
+        ---
+        
+        #### `fit_batch_stiiHLW(data, mask=None, x0=None, max_iter=100)`
+        Fit many same-sized (or masked/ragged) datasets at once (module `fitting`).
+        
+        **Parameters:**
+        - `data`: 2-D array (datasets × observations) or list of 1-D arrays
+        - `mask`: optional boolean array of observed entries
+        
+        **Returns:** `BatchFitResult` with per-dataset `params`, `loglik`, `converged`, `nit`
+        
+        ---
+        
+        #### `fit_stiiHLW_chunked(source, method='L-BFGS-B', chunk_size=262144, n_threads=None)`
+        Out-of-core fit over data larger than memory (module `fitting`).
+        
+        **Parameters:**
+        - `source`: path to a `.npy` file (memory-mapped), an array/memmap, or a callable returning a fresh chunk iterator
+        - `chunk_size`: observations per chunk; peak memory scales with this, not the data size
+        - `n_threads`: threads evaluating chunks in parallel
+        
+        **Returns:** `FitResult`; `chunked_loglik(source, lam, k, alpha, deriv)` gives the accumulated likelihood
+        
+        ---
+        
+        #### `OnlineSTIIHLW(x0=None, polish_every=None, min_count=200)`
+        Incremental estimator for streaming data (module `fitting`).
+        
+        **Methods:**
+        - `partial_fit(batch)`: O(batch) recursive Newton update of the running estimate
+        - `result()`: current `FitResult`; its `loglik` comes from the running quadratic
+          model (approximate) unless `loglik_exact`; raises `RuntimeError` before the first fit
+        
+        Until `min_count` observations have arrived, every batch refits all data exactly.
+        Batches with non-finite score or Hessian are skipped (`n_rejected`).
+        With `polish_every=m`, every m-th batch triggers a full-history refit; a failed
+        refit also counts in `n_rejected`.
+        
+        ---
+        
+        #### `fit_stiiHLW_subsample(data, sample_size=100_000, max_newton=5, tol=0.1)`
+        Fast fit for very large samples (module `fitting`).
+        
+        Fits a tail-stratified, inverse-probability-weighted subsample, then
+        polishes with full-data Newton steps. `details` reports the subsample
+        estimate, how far the polish moved it, the time per phase and the
+        estimated speed-up over a full-data `fit_stiiHLW`.
+        
+        ---
+        
+        #### `stiiHLW_loglik(data, lam, k, alpha, deriv=0, weights=None)`
+        Log-likelihood with optional analytic derivatives.
+        
+        **Parameters:**
+        - `data`: array-like, observed data (summed over the last axis)
+        - `lam`, `k`, `alpha`: distribution parameters (shape `(B, 1)` for stacked datasets)
+        - `deriv`: 0, 1 (add score vector) or 2 (add score and Hessian)
+        - `weights`: optional per-observation weights
+        
+        **Returns:** Log-likelihood, or tuple (loglik, score, Hessian) up to `deriv`
+        
+        ---
+        
+        #### `stiiHLW_censored_loglik(data, censoring, lam, k, alpha, deriv=0, upper=None, weights=None)`
+        Log-likelihood of exact and censored observations.
+        
+        **Censoring codes:**
+        - `EXACT` (0): failure observed at `x`, contributes `log f(x)`
+        - `RIGHT_CENSORED` (1): still running at `x`, contributes `log S(x)`
+        - `LEFT_CENSORED` (2): failed before `x`, contributes `log F(x)`
+        - `INTERVAL_CENSORED` (3): failed between `x` and `upper`
+        
+        `deriv=1` adds the analytic score. Pass the same codes to `fit_stiiHLW`
+        or `mle_stiiHLW` as `censoring=` to fit censored data.
+        
+        ---
+        
+        #### `goodness_of_fit(data, lam, k, alpha, weights=None, bins=None)`
         Calculate goodness-of-fit statistics.
         
         **Parameters:**
         - `data`: array-like, observed data
         - `lam`, `k`, `alpha`: distribution parameters
+        - `weights`, `bins`: frequency counts or `(edges, counts)`, as for `mle_stiiHLW`
         
         **Returns:** Dictionary with KS statistic, AIC, BIC, log-likelihood
         
         ---
         
-        #### `generate_stiiHLW_samples(n, lam, k, alpha)`
+        #### `frequency_table(data, decimals=None)`
+        Distinct values and counts, for fitting heavily tied data via `weights`.
+        
+        **Returns:** Tuple (values, counts)
+        
+        ---
+        
+        #### `generate_stiiHLW_samples(n, lam, k, alpha, random_state=None)`
         Generate random samples.
         
         **Parameters:**
-        - `n`: int, number of samples
+        - `n`: int or tuple, number (or shape) of samples
         - `lam`, `k`, `alpha`: distribution parameters
+        - `random_state`: `numpy.random.Generator`, seed or None
         
         **Returns:** Array of random samples
+        
+        ---
+        
+        #### `stiiHLW_rvs_chunks(n, lam, k, alpha, chunk_size=1_000_000, random_state=None)`
+        Stream `n` random samples in chunks with bounded memory.
+        
+        **Returns:** Generator of sample arrays
+        
+        ---
+        
+        #### `simulate_stiiHLW(lam, k, alpha, n_simulations, n_samples, percentile_levels=(5, 25, 50, 75, 95), thresholds=(), retain=0, seed=None, keep_replicates=True, n_workers=1, sampling="standard")`
+        Monte Carlo study of `n_simulations` samples of size `n_samples` (module `simulation`).
+        
+        Replicates are drawn in blocks with the vectorized sampler and each block is reduced to
+        per-replicate statistics before the next is drawn, so memory depends on the block size
+        (`max_block_bytes`, default 4 MB) rather than on `n_simulations × n_samples`.
+        
+        - `seed`: each block draws from its own `SeedSequence(seed).spawn` stream
+        - `n_workers`: process count (None for all cores; 1 runs in-process); results for a given
+          seed are bit-identical for any worker count
+        - `sampling`: one of `SAMPLING_METHODS` — `"standard"` (i.i.d.), `"antithetic"` (u paired
+          with 1 − u), `"sobol"` / `"halton"` (one `scipy.stats.qmc` point set, randomly
+          digit-shifted or shifted per replicate) or `"control"` (replicate means and exceedance fractions corrected
+          with the exact mean and exact decile exceedances as control variates)
+        
+        `result.variance_reduction()` returns the factor by which each mode cut the variance of
+        the replicate means and of each exceedance fraction, relative to the exact plain Monte
+        Carlo variance: the number of times fewer draws needed for the same interval width.
+        
+        **Returns:** `SimulationResult` with `means`, `stds`, `percentiles`, `exceedance`
+        (fraction above each of `thresholds`) and the raw `traces` of the first `retain` replicates,
+        plus `stats`: mergeable accumulators filled during the run (moments of all draws, moments
+        and a quantile sketch of the replicate means and exceedance fractions). With
+        `keep_replicates=False` only `stats` and `traces` are kept.
+        
+        ---
+        
+        #### `MomentAccumulator()` / `QuantileSketch(k=256, seed=0)`
+        One-pass summaries (module `accumulators`): `update(values)` adds a batch and
+        `merge(other)` combines accumulators built on other blocks, threads or processes.
+        `MomentAccumulator` gives `count`, `mean`, `var(ddof)`, `std(ddof)`, `skewness` and
+        `kurtosis` (excess) exactly; `QuantileSketch` (KLL) gives `quantile(q)` and `cdf(x)` to
+        within a rank error of about 1% while retaining a few hundred values.
+        
+        ---
+        
+        #### `SimulationResult.risk_curve(level=0.95)`
+        Exceedance probability against every one of the study's `thresholds` as a `RiskCurve`:
+        `exact` (from `stiiHLW_sf`), simulated `mean`, and `lower`/`upper` bounds containing the
+        central `level` of replicates. `at(t)` looks up the nearest tabulated threshold.
+        
+        ---
+        
+        #### `exceedance_fractions(samples, thresholds, presorted=False)`
+        Fraction of each row of `samples` above each threshold, shape `(len(thresholds), n_rows)`.
+        Each row is sorted and binned once, so a whole threshold vector costs little more than one.
         """)
     
     with tab4:
@@ -1940,6 +2307,11 @@ elif page == "⚙️ System":
         st.markdown("**Required Modules:**")
         st.code("""
         distributions.py  # Core distribution functions
+        fitting.py       # Bootstrap and large-scale fitting engines
+        simulation.py    # Monte Carlo engine and risk curves
+        accumulators.py  # Mergeable moment and quantile accumulators
+        tables.py        # Summary statistics and their precomputed table
+        stiihlw_table.npz  # Precomputed table read by tables.py
         plots.py         # Visualization utilities
         """)
         
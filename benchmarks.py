@@ -0,0 +1,630 @@
+import os
+import time
+import tracemalloc
+from collections import Counter
+import numpy as np
+from scipy.integrate import trapezoid
+from scipy.optimize import brentq, minimize
+
+from distributions import (
+    EXACT, RIGHT_CENSORED,
+    stiiHLW_cdf, stiiHLW_eval, stiiHLW_quantile, stiiHLW_rvs,
+    FitResult, fit_stiiHLW, mle_stiiHLW, stiiHLW_loglik, weibull_cdf,
+    weibull_pdf, stiiHLW_moments
+)
+from fitting import fit_stiiHLW_multistart, fit_stiiHLW_subsample
+
+
+def _timeit(func, repeat=3):
+    """Best wall-clock time of func() over a few repeats"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func):
+    """Peak bytes allocated while running func()"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+TRANSCENDENTAL = {"exp", "expm1", "expit", "log", "log1p", "logaddexp", "power",
+                  "sin", "cos", "tan", "arcsin", "arccos"}
+
+
+class _UfuncCounter(np.ndarray):
+    """ndarray view that tallies every ufunc applied to it (and its descendants)"""
+    counts = Counter()
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        args = [i.view(np.ndarray) if isinstance(i, _UfuncCounter) else i for i in inputs]
+        result = getattr(ufunc, method)(*args, **kwargs)
+        _UfuncCounter.counts[ufunc.__name__] += 1
+        if isinstance(result, np.ndarray) and result.ndim > 0:
+            return result.view(_UfuncCounter)
+        return result
+
+
+def _count_ufuncs(func, x):
+    """Full-grid (transcendental, total) ufunc passes made by func(x)"""
+    _UfuncCounter.counts = Counter()
+    # Kernels call np.asarray on their input, which would drop the subclass
+    asarray = np.asarray
+    np.asarray = np.asanyarray
+    try:
+        func(x.view(_UfuncCounter))
+    finally:
+        np.asarray = asarray
+    counts = _UfuncCounter.counts
+    return sum(counts[name] for name in TRANSCENDENTAL), sum(counts.values())
+
+
+def _legacy_pdf(x, lam, k, alpha):
+    """Reference density (the original separate-call implementation)"""
+    G = np.clip(weibull_cdf(x, lam, k), 1e-15, 1-1e-15)
+    g = weibull_pdf(x, lam, k)
+    T = G**alpha / (G**alpha + (1-G)**alpha)
+    dT_dG = alpha * G**(alpha-1) * (1-G)**(alpha-1) / (G**alpha + (1-G)**alpha)**2
+    return (np.pi/2) * np.cos((np.pi/2) * T) * dT_dG * g
+
+
+def _legacy_cdf(x, lam, k, alpha):
+    """Reference CDF (the original separate-call implementation)"""
+    G = np.clip(weibull_cdf(x, lam, k), 1e-15, 1-1e-15)
+    T = G**alpha / (G**alpha + (1-G)**alpha)
+    return np.sin((np.pi/2) * T)
+
+
+def _legacy_all(x, lam, k, alpha):
+    """pdf, cdf, sf and hazard as the Distribution Explorer used to compute them"""
+    pdf = _legacy_pdf(x, lam, k, alpha)
+    cdf = _legacy_cdf(x, lam, k, alpha)
+    sf = 1 - _legacy_cdf(x, lam, k, alpha)
+    hz_pdf = _legacy_pdf(x, lam, k, alpha)
+    hz_sf = 1 - _legacy_cdf(x, lam, k, alpha)
+    hz = np.where(hz_sf > 0, hz_pdf/hz_sf, 0)
+    return pdf, cdf, sf, hz
+
+
+def _quantile_brentq(p, lam, k, alpha):
+    """Reference root-finding quantile (the original scalar implementation)"""
+    if p <= 0:
+        return 0
+    if p >= 1:
+        return np.inf
+
+    def func(x):
+        return stiiHLW_cdf(np.array([x]), lam, k, alpha)[0] - p
+
+    try:
+        upper = lam * (-np.log(1e-10))**(1/k) * 10
+        return brentq(func, 0, upper)
+    except:
+        return np.nan
+
+
+def bench_quantile(sizes=(10**3, 10**4, 10**5, 10**6, 10**7), params=(1.0, 1.5, 1.0),
+                   brentq_limit=10**4):
+    """Closed-form vectorized quantile vs. the per-point brentq path
+
+    The brentq path is timed up to ``brentq_limit`` points and extrapolated
+    linearly beyond that, since it costs one root solve per probability.
+    """
+    lam, k, alpha = params
+    rng = np.random.default_rng(0)
+    rows = []
+    per_point = None
+    for n in sizes:
+        p = rng.uniform(0, 1, n)
+        t_fast = _timeit(lambda: stiiHLW_quantile(p, lam, k, alpha))
+        if n <= brentq_limit:
+            t_slow = _timeit(lambda: [_quantile_brentq(pi, lam, k, alpha) for pi in p], repeat=1)
+            per_point = t_slow / n
+            measured = True
+        else:
+            t_slow = per_point * n
+            measured = False
+        rows.append((n, t_fast, t_slow, measured))
+
+    print(f"{'n':>10} {'closed-form (s)':>16} {'brentq (s)':>12} {'speed-up':>10}")
+    for n, t_fast, t_slow, measured in rows:
+        mark = "" if measured else "*"
+        print(f"{n:>10} {t_fast:>16.5f} {t_slow:>11.3f}{mark:1} {t_slow/t_fast:>10.0f}")
+    print("* extrapolated from the largest measured brentq run")
+    return rows
+
+
+def bench_eval(n=1000, params=(1.0, 1.5, 1.0), repeat=200):
+    """Fused stiiHLW_eval vs. separate pdf/cdf/sf/hazard calls on one grid
+
+    Reports wall-clock time, peak temporary memory and the number of
+    full-grid transcendental and total ufunc passes for each path.
+    """
+    lam, k, alpha = params
+    x = np.linspace(0.001, 10, n)
+    which = ("pdf", "cdf", "sf", "hazard")
+    with np.errstate(all="ignore"):
+        paths = {
+            "separate": lambda xs: _legacy_all(xs, lam, k, alpha),
+            "fused": lambda xs: stiiHLW_eval(xs, lam, k, alpha, which),
+        }
+        rows = []
+        for name, func in paths.items():
+            t = _timeit(lambda: func(x), repeat=repeat)
+            peak = _peak_memory(lambda: func(x))
+            n_trans, n_total = _count_ufuncs(func, x)
+            rows.append((name, t, peak, n_trans, n_total))
+
+    print(f"{'path':>10} {'time (us)':>10} {'peak (KiB)':>11} {'transc.':>8} {'ufuncs':>7}")
+    for name, t, peak, n_trans, n_total in rows:
+        print(f"{name:>10} {t*1e6:>10.1f} {peak/1024:>11.1f} {n_trans:>8} {n_total:>7}")
+    return rows
+
+
+def _mle_finite_difference(data):
+    """Reference fit: L-BFGS-B on the clipped-pdf objective with numerical gradients"""
+    def neg_log_likelihood(params):
+        lam, k, alpha = params
+        if lam <= 0 or k <= 0 or alpha <= 0:
+            return np.inf
+        pdf_vals = np.clip(_legacy_pdf(data, lam, k, alpha), 1e-15, None)
+        return -np.sum(np.log(pdf_vals))
+
+    bounds = [(0.1, 10*np.max(data)), (0.1, 10), (0.1, 10)]
+    return minimize(neg_log_likelihood, [np.mean(data), 2.0, 1.0],
+                    bounds=bounds, method='L-BFGS-B').x
+
+
+def bench_mle(sizes=(10**4, 10**5, 10**6), params=(2.0, 1.5, 0.7)):
+    """Wall-clock per fit: finite-difference gradients vs. analytic score/Hessian"""
+    paths = {
+        "finite-diff": _mle_finite_difference,
+        "analytic": lambda d: mle_stiiHLW(d),
+        "trust-constr": lambda d: mle_stiiHLW(d, method='trust-constr'),
+    }
+    rows = []
+    with np.errstate(all="ignore"):
+        for n in sizes:
+            data = stiiHLW_rvs(*params, size=n, random_state=0)
+            for name, fit in paths.items():
+                t = _timeit(lambda: fit(data), repeat=1)
+                rows.append((n, name, t, np.asarray(fit(data))))
+
+    print(f"{'n':>9} {'path':>13} {'time (s)':>9}   estimate")
+    for n, name, t, est in rows:
+        print(f"{n:>9} {name:>13} {t:>9.3f}   {np.array2string(est, precision=4)}")
+    return rows
+
+
+def bench_subsample(sizes=(10**6, 10**7), params=(2.0, 1.5, 0.7), sample_size=100_000):
+    """Subsample-then-refine vs. a full-data fit: speed-up and parameter shift
+
+    The shift is the largest difference from the full-data MLE in units of
+    its standard errors; "reported" is the speed-up the subsample fit
+    estimates for itself in ``details``.
+    """
+    rows = []
+    with np.errstate(all="ignore"):
+        for n in sizes:
+            data = stiiHLW_rvs(*params, size=n, random_state=0)
+            start = time.perf_counter()
+            full = fit_stiiHLW(data)
+            t_full = time.perf_counter() - start
+            start = time.perf_counter()
+            fast = fit_stiiHLW_subsample(data, sample_size=sample_size, random_state=0)
+            t_fast = time.perf_counter() - start
+            shift = np.max(np.abs(fast.params - full.params) / full.standard_errors)
+            rows.append((n, t_full, t_fast, fast.details['speedup'], fast.details['full_passes'], shift))
+
+    print(f"{'n':>9} {'full (s)':>9} {'subsample (s)':>14} {'speed-up':>9} {'reported':>9} {'passes':>7} {'shift (SE)':>11}")
+    for n, t_full, t_fast, reported, steps, shift in rows:
+        print(f"{n:>9} {t_full:>9.2f} {t_fast:>14.2f} {t_full/t_fast:>9.1f} {reported:>9.1f} {steps:>7} {shift:>11.4f}")
+    return rows
+
+
+def _fit_legacy_start(data):
+    """Analytic-score fit as the original core ran it: raw parameters, fixed start and bounds"""
+    start = np.array([np.mean(data), 2.0, 1.0])
+    bounds = [(0.1, 10*np.max(data)), (0.1, 10), (0.1, 10)]
+
+    def neg_log_likelihood(params):
+        ll, grad = stiiHLW_loglik(data, *params, deriv=1)
+        return -ll, -grad
+
+    result = minimize(neg_log_likelihood, start, jac=True, bounds=bounds, method='L-BFGS-B')
+    params = result.x if result.success else start
+    return FitResult(params, stiiHLW_loglik(data, *params), np.eye(3),
+                     success=result.success, nit=result.nit)
+
+
+def bench_initializer(lams=(0.01, 1.0, 1000.0), ks=(0.3, 1.0, 3.0, 20.0),
+                      alphas=(0.2, 1.0, 5.0), n=2000, seed=0):
+    """Optimizer iterations and failures: fixed start vs. data-driven start
+
+    Over a grid of true parameters, counts L-BFGS-B iterations, fallbacks
+    (optimizer failure, so the start is returned), fits that end on one of
+    the old fixed bounds (the current fit has none), and fits whose
+    log-likelihood falls short of the better of the two by more than 1e-3.
+    """
+    paths = {"fixed start": _fit_legacy_start, "initializer": fit_stiiHLW}
+    stats = {name: {"nit": [], "fallback": 0, "at_bound": 0, "worse": 0, "time": 0.0}
+             for name in paths}
+    cases = 0
+    with np.errstate(all="ignore"):
+        for lam in lams:
+            for k in ks:
+                for alpha in alphas:
+                    data = stiiHLW_rvs(lam, k, alpha, size=n, random_state=seed)
+                    fits = {}
+                    for name, fit in paths.items():
+                        start = time.perf_counter()
+                        fits[name] = fit(data)
+                        stats[name]["time"] += time.perf_counter() - start
+                    best = max(f.loglik for f in fits.values())
+                    for name, f in fits.items():
+                        st = stats[name]
+                        st["nit"].append(f.nit)
+                        st["fallback"] += not f.success
+                        st["worse"] += f.loglik < best - 1e-3
+                    legacy = fits["fixed start"].params
+                    bounds = [(0.1, 10*np.max(data)), (0.1, 10), (0.1, 10)]
+                    stats["fixed start"]["at_bound"] += any(
+                        np.isclose(v, lo) or np.isclose(v, hi) for v, (lo, hi) in zip(legacy, bounds))
+                    cases += 1
+
+    print(f"{cases} parameter sets, n={n}")
+    print(f"{'start':>12} {'mean nit':>9} {'max nit':>8} {'fallback':>9} {'at bound':>9} "
+          f"{'worse':>6} {'time (s)':>9}")
+    for name, st in stats.items():
+        print(f"{name:>12} {np.mean(st['nit']):>9.1f} {np.max(st['nit']):>8} {st['fallback']:>9} "
+              f"{st['at_bound']:>9} {st['worse']:>6} {st['time']:>9.2f}")
+    return stats
+
+
+def bench_units(units=(1e-6, 1e-3, 1.0, 1e3, 1e6), params=(1.0, 1.5, 0.7), n=5000, seed=0):
+    """Iterations and estimates when the same sample is given in other units
+
+    Compares the original raw-parameter core with the current fit; a
+    unit-invariant fit needs the same iterations and returns lam scaled by
+    the unit with k and alpha unchanged.
+    """
+    base = stiiHLW_rvs(*params, size=n, random_state=seed)
+    reference = fit_stiiHLW(base)
+    paths = {"raw box": _fit_legacy_start, "log-scaled": fit_stiiHLW}
+    rows = []
+    with np.errstate(all="ignore"):
+        for name, fit in paths.items():
+            for unit in units:
+                try:
+                    f = fit(base * unit)
+                except ValueError:
+                    # The fixed box (0.1, 10 * max) is empty for small units
+                    rows.append((name, unit, -1, False, np.nan))
+                    continue
+                est = np.asarray(f.params) / [unit, 1, 1]
+                rel = np.max(np.abs(est - reference.params) / reference.params)
+                rows.append((name, unit, f.nit, f.success, rel))
+
+    print(f"{'core':>10} {'unit':>8} {'nit':>5} {'success':>8} {'max rel. diff':>14}")
+    for name, unit, nit, success, rel in rows:
+        print(f"{name:>10} {unit:>8.0e} {nit:>5} {str(success):>8} {rel:>14.2e}")
+    print("nit -1: the fit raised (empty bounds)")
+    return rows
+
+
+def bench_multistart(ks=(0.3, 1.0, 3.0, 20.0), alphas=(0.2, 1.0, 5.0), sizes=(50, 200),
+                     seeds=(0, 1, 2), n_starts=16, n_workers=1):
+    """Reliability and cost of multi-start fitting with early stopping
+
+    The reference for each sample is the best of all ``n_starts`` local
+    fits run to completion; a fit counts as missing it when its
+    log-likelihood is lower by more than 1e-3. Times are totals over the
+    grid (lam is 1; the fit is unit-invariant).
+    """
+    stats = {name: {"missed": 0, "worst": 0.0, "fits": 0, "time": 0.0}
+             for name in ("single", "multistart")}
+    cases = 0
+    with np.errstate(all="ignore"):
+        for k in ks:
+            for alpha in alphas:
+                for n in sizes:
+                    for seed in seeds:
+                        data = stiiHLW_rvs(1.0, k, alpha, size=n, random_state=seed)
+                        best = fit_stiiHLW_multistart(data, n_starts=n_starts, seed=0,
+                                                      n_workers=n_workers, agree=n_starts + 1).loglik
+                        paths = {
+                            "single": lambda: (fit_stiiHLW(data), 1),
+                            "multistart": lambda: (lambda f: (f, f.details["n_run"]))(
+                                fit_stiiHLW_multistart(data, n_starts=n_starts, seed=0,
+                                                       n_workers=n_workers)),
+                        }
+                        for name, run in paths.items():
+                            start = time.perf_counter()
+                            fit, n_fits = run()
+                            st = stats[name]
+                            st["time"] += time.perf_counter() - start
+                            st["fits"] += n_fits
+                            st["missed"] += fit.loglik < best - 1e-3
+                            st["worst"] = max(st["worst"], best - fit.loglik)
+                        cases += 1
+
+    print(f"{cases} samples, {n_starts} starts, {n_workers} worker(s)")
+    print(f"{'path':>11} {'missed':>7} {'worst gap':>10} {'fits/sample':>12} {'time (s)':>9}")
+    for name, st in stats.items():
+        print(f"{name:>11} {st['missed']:>7} {st['worst']:>10.4f} {st['fits']/cases:>12.1f} "
+              f"{st['time']:>9.2f}")
+    return stats
+
+
+def bench_censored(n=10**6, params=(2.0, 1.5, 0.7), horizons=(4.0, 0.6), seed=0):
+    """Right-censored fleet: censored fit vs. uncensored fit vs. dropping censored units
+
+    Failure times are drawn from the model and each unit is observed until
+    a uniform censoring time on (0, horizon). The uncensored fit sees every
+    true failure time and is the timing reference.
+    """
+    rng = np.random.default_rng(seed)
+    failures = stiiHLW_rvs(*params, size=n, random_state=rng)
+    start = time.perf_counter()
+    full = fit_stiiHLW(failures)
+    t_full = time.perf_counter() - start
+
+    rows = []
+    with np.errstate(all="ignore"):
+        for horizon in horizons:
+            limit = rng.uniform(0, horizon, n)
+            observed = np.minimum(failures, limit)
+            censoring = np.where(failures <= limit, EXACT, RIGHT_CENSORED)
+            start = time.perf_counter()
+            fit = fit_stiiHLW(observed, censoring=censoring)
+            t_cens = time.perf_counter() - start
+            naive = fit_stiiHLW(observed[censoring == EXACT])
+            rows.append((horizon, np.mean(censoring == RIGHT_CENSORED), t_cens, fit, naive))
+
+    print(f"n={n}, true {params}; uncensored fit {t_full:.2f} s -> "
+          f"{np.array2string(full.params, precision=3)}")
+    print(f"{'censored':>9} {'time (s)':>9} {'vs full':>8}   {'censored fit':>24}   dropping censored")
+    for horizon, frac, t, fit, naive in rows:
+        print(f"{frac:>9.1%} {t:>9.2f} {t/t_full:>8.2f}   "
+              f"{np.array2string(fit.params, precision=3):>24}   "
+              f"{np.array2string(naive.params, precision=3)}")
+    return rows
+
+
+def bench_moments(shapes=((1.5, 0.7), (0.5, 0.3), (3.0, 5.0), (1.0, 0.1)),
+                  x_max=10.0, n_grid=1000, repeat=200):
+    """Raw moments: 1000-point trapezoid on (0, x_max] vs. quantile-domain quadrature
+
+    The trapezoid rule is what the app used, on the Explorer's default
+    x-axis; it truncates the upper tail and under-resolves spikes at 0.
+    """
+    from distributions import _unit_moments
+    x = np.linspace(0.001, x_max, n_grid)
+    orders = np.arange(1, 5)[:, None]
+    print(f"{'k':>5} {'alpha':>6} {'trap rel err (m1..m4)':>40} {'quad est':>9} "
+          f"{'trap (us)':>10} {'cold (us)':>10} {'cached (us)':>12}")
+    for k, alpha in shapes:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            pdf = stiiHLW_eval(x, 1.0, k, alpha, ("pdf",))["pdf"]
+            trap = trapezoid(x**orders * pdf, x, axis=1)
+        t_trap = (time.perf_counter() - start) / repeat
+
+        _unit_moments.cache_clear()
+        start = time.perf_counter()
+        exact, err = stiiHLW_moments(1.0, k, alpha)
+        t_cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            stiiHLW_moments(1.0, k, alpha)
+        t_hot = (time.perf_counter() - start) / repeat
+
+        rel = np.abs(trap - exact) / exact
+        print(f"{k:>5} {alpha:>6} {np.array2string(rel, precision=1):>40} "
+              f"{np.max(err / exact):>9.0e} {t_trap*1e6:>10.0f} {t_cold*1e6:>10.0f} {t_hot*1e6:>12.1f}")
+
+
+def bench_summary_table(n_queries=200, seed=0):
+    """Explorer summaries: table lookup vs. exact computation at random (k, alpha)"""
+    from tables import _exact_summary, load_summary_table, stiiHLW_summary
+    if load_summary_table() is None:
+        print("no summary table; run `python tables.py` first")
+        return
+    rng = np.random.default_rng(seed)
+    shapes = np.exp(rng.uniform(np.log(0.1), np.log(20), (n_queries, 2)))
+    fields = ("mean", "std", "skewness", "kurtosis", "mode")
+    errors = {name: [] for name in fields}
+    t_exact, t_table, mismatch = [], [], 0
+    for k, alpha in shapes:
+        start = time.perf_counter()
+        exact = _exact_summary(1.0, k, alpha)
+        t_exact.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        fast = stiiHLW_summary(1.0, k, alpha)
+        t_table.append(time.perf_counter() - start)
+        for name in fields:
+            scale = exact["median"] if name == "mode" else abs(exact[name])
+            errors[name].append(abs(fast[name] - exact[name]) / scale)
+        mismatch += fast["hazard_shape"] != exact["hazard_shape"]
+
+    print(f"{n_queries} random shapes; exact {np.median(t_exact)*1e3:.2f} ms, "
+          f"table {np.median(t_table)*1e6:.0f} us (median per query), "
+          f"hazard-shape mismatches {mismatch}")
+    for name in fields:
+        print(f"  {name:>9}: median rel err {np.median(errors[name]):.1e}, "
+              f"max {np.max(errors[name]):.1e}")
+
+
+def bench_interpolant(shapes=((1.5, 0.7), (0.3, 0.2), (20.0, 0.1)), tol=1e-10,
+                      sizes=(10**4, 10**5, 10**6, 10**7), seed=0):
+    """Cached ppf/cdf interpolants vs. closed forms, and where building one pays off
+
+    "cold" includes building the table (cleared from the LRU cache first),
+    "warm" reuses it. Break-even is the number of points at which the
+    build time has been recovered by the faster evaluation.
+    """
+    from distributions import STIIHLW, _cdf_table, _ppf_table
+    rng = np.random.default_rng(seed)
+    u = rng.random(max(sizes))
+    for k, alpha in shapes:
+        dist = STIIHLW(1.0, k, alpha)
+        x = dist.ppf(u)
+        for name, func, arg, table in (("ppf", dist.ppf, u, _ppf_table),
+                                       ("cdf", dist.cdf, x, _cdf_table)):
+            table.cache_clear()
+            start = time.perf_counter()
+            func(arg[:1], tol)
+            t_build = time.perf_counter() - start
+            rows = []
+            for n in sizes:
+                start = time.perf_counter()
+                exact = func(arg[:n])
+                t_exact = time.perf_counter() - start
+                start = time.perf_counter()
+                approx = func(arg[:n], tol)
+                t_warm = time.perf_counter() - start
+                rows.append((n, t_exact, t_warm, np.max(np.abs(approx / exact - 1))))
+            n, t_exact, t_warm, _ = rows[-1]
+            saving = (t_exact - t_warm) / n
+            even = f"{t_build / saving:.1e}" if saving > 0 else "never"
+            print(f"k={k} alpha={alpha} {name}: build {t_build*1e3:.0f} ms, "
+                  f"{t_exact/n*1e9:.0f} -> {t_warm/n*1e9:.0f} ns/point, break-even at {even} points")
+            for n, t_exact, t_warm, err in rows:
+                print(f"  n={n:>9,}: exact {t_exact*1e3:8.1f} ms  cold {(t_warm + t_build)*1e3:8.1f} ms  "
+                      f"warm {t_warm*1e3:8.1f} ms  max rel err {err:.1e}")
+
+
+def bench_simulation(params=(1.0, 1.5, 1.0), n_simulations=2000, n_samples=10000):
+    """Monte Carlo page: per-replicate loop into one array vs. block-wise reduction"""
+    from distributions import generate_stiiHLW_samples
+    from simulation import simulate_stiiHLW
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    simulations = np.array([generate_stiiHLW_samples(n_samples, *params)
+                            for _ in range(n_simulations)])
+    means = np.mean(simulations, axis=1)
+    np.std(simulations, axis=1)
+    np.percentile(simulations, [5, 25, 50, 75, 95], axis=1)
+    np.mean(simulations > 5.0, axis=1)
+    t_loop = time.perf_counter() - start
+    peak_loop = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del simulations
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = simulate_stiiHLW(*params, n_simulations, n_samples, thresholds=[5.0], retain=100)
+    t_block = time.perf_counter() - start
+    peak_block = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{n_simulations} x {n_samples} draws; mean of means {np.mean(means):.4f} (loop) "
+          f"vs {np.mean(result.means):.4f} (blocks)")
+    print(f"  loop + np.array: {t_loop:.2f} s, peak {peak_loop / 2**20:.0f} MB")
+    print(f"  block-wise:      {t_block:.2f} s, peak {peak_block / 2**20:.0f} MB")
+
+
+def bench_accumulators(n=10**6, n_blocks=200, params=(1.0, 1.5, 1.0)):
+    """Full-array numpy summaries vs. per-block accumulators merged afterwards"""
+    from accumulators import MomentAccumulator, QuantileSketch
+
+    x = stiiHLW_rvs(*params, size=n, random_state=0)
+    levels = np.array([0.025, 0.5, 0.975])
+    start = time.perf_counter()
+    exact = np.mean(x), np.std(x), np.percentile(x, 100 * levels)
+    t_numpy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    moments, sketch = MomentAccumulator(), QuantileSketch()
+    for block in np.array_split(x, n_blocks):
+        moments.merge(MomentAccumulator().update(block))
+        sketch.merge(QuantileSketch().update(block))
+    estimate = sketch.quantile(levels)
+    t_merged = time.perf_counter() - start
+
+    rank_error = np.abs(np.searchsorted(np.sort(x), estimate) / n - levels).max()
+    print(f"{n} draws in {n_blocks} blocks: numpy {t_numpy * 1e3:.0f} ms, "
+          f"accumulators {t_merged * 1e3:.0f} ms ({sketch.size} values retained)")
+    print(f"  mean/std rel. error {abs(moments.mean / exact[0] - 1):.1e}/"
+          f"{abs(moments.std() / exact[1] - 1):.1e}, max quantile rank error {rank_error:.4f}")
+
+
+def bench_parallel_simulation(params=(1.0, 1.5, 1.0), n_simulations=4000, n_samples=10000):
+    """Block-wise Monte Carlo in-process vs. on all cores, with the same seed"""
+    from simulation import simulate_stiiHLW
+
+    results = []
+    for n_workers in (1, max(os.cpu_count() or 1, 2)):
+        start = time.perf_counter()
+        results.append(simulate_stiiHLW(*params, n_simulations, n_samples, thresholds=[5.0],
+                                        seed=0, n_workers=n_workers))
+        print(f"{n_simulations} x {n_samples} draws, {n_workers} worker(s): "
+              f"{time.perf_counter() - start:.2f} s")
+    serial, parallel = results
+    identical = (np.array_equal(serial.means, parallel.means)
+                 and serial.stats.draws.mean == parallel.stats.draws.mean)
+    print(f"  bit-identical across worker counts: {identical}")
+
+
+def bench_risk_curve(params=(1.0, 1.5, 1.0), n_simulations=1000, n_samples=1000, n_thresholds=201):
+    """Risk tab: per-replicate loop per threshold vs. one binning pass and lookups"""
+    from simulation import exceedance_fractions
+
+    draws = stiiHLW_rvs(*params, size=(n_simulations, n_samples), random_state=0)
+    thresholds = np.linspace(0.0, 20.0, n_thresholds)
+
+    start = time.perf_counter()
+    loop = np.array([[np.mean(sim > t) for sim in draws] for t in thresholds])
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    binned = exceedance_fractions(draws, thresholds)
+    t_binned = time.perf_counter() - start
+
+    print(f"{n_thresholds} thresholds over {n_simulations} x {n_samples} draws: "
+          f"loop {t_loop:.2f} s ({t_loop / n_thresholds * 1e3:.1f} ms per slider move), "
+          f"binned {t_binned * 1e3:.0f} ms once; identical: {np.array_equal(loop, binned)}")
+
+
+def bench_variance_reduction(params=(1.0, 1.5, 1.0), n_simulations=1000, n_samples=1000):
+    """Monte Carlo sampling modes: time and variance reduction vs. plain draws"""
+    from simulation import SAMPLING_METHODS, simulate_stiiHLW
+
+    thresholds = [0.5, 1.0, 2.0]
+    print(f"{n_simulations} x {n_samples} draws; variance reduction of the mean and of "
+          f"P(X > t) for t = {thresholds}")
+    for sampling in SAMPLING_METHODS:
+        start = time.perf_counter()
+        result = simulate_stiiHLW(*params, n_simulations, n_samples, thresholds=thresholds,
+                                  seed=0, keep_replicates=False, sampling=sampling)
+        elapsed = time.perf_counter() - start
+        factors = result.variance_reduction()
+        print(f"  {sampling:<10} {elapsed:5.2f} s  mean x{factors['mean']:7.1f}  exceedance "
+              + " ".join(f"x{f:6.1f}" for f in factors["exceedance"]))
+
+
+if __name__ == "__main__":
+    bench_quantile()
+    bench_eval()
+    bench_mle()
+    bench_subsample()
+    bench_initializer()
+    bench_units()
+    bench_multistart()
+    bench_censored()
+    bench_moments()
+    bench_summary_table()
+    bench_interpolant()
+    bench_simulation()
+    bench_accumulators()
+    bench_parallel_simulation()
+    bench_risk_curve()
+    bench_variance_reduction()
@@ -1,7 +1,9 @@
 import numpy as np
-from scipy.special import gamma, gammainc, digamma
+from scipy.special import gamma, gammainc, digamma, expit
 from scipy.optimize import minimize
+from scipy.integrate import quad
 import warnings
+from functools import lru_cache
 
 def weibull_pdf(x, lam, k):
     """Weibull probability density function"""
@@ -29,106 +31,873 @@ def weibull_hazard(x, lam, k):
         sf = weibull_sf(x, lam, k)
         return np.where(sf > 0, pdf/sf, 0)
 
-def stiiHLW_pdf(x, lam, k, alpha):
-    """STIIHL Weibull probability density function"""
+STIIHLW_FUNCTIONS = ("pdf", "cdf", "sf", "hazard", "cumhazard", "logpdf", "logcdf", "logsf")
+
+def stiiHLW_eval(x, lam, k, alpha, which=STIIHLW_FUNCTIONS):
+    """Evaluate several STIIHL Weibull functions in a single pass
+
+    The shared intermediates z = (x/lam)**k, G, log G and the TIIHL
+    transform T are computed once and every function named in ``which``
+    is derived from them. T is carried through its log-odds
+    w = log((1-G)**alpha / G**alpha) so that both tails stay accurate.
+    Returns a dict keyed by function name; x <= 0 is outside the support.
+    """
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        G = weibull_cdf(x, lam, k)
-        g = weibull_pdf(x, lam, k)
-        
-        # Handle edge cases
-        G = np.clip(G, 1e-15, 1-1e-15)
-        
-        T = G**alpha / (G**alpha + (1-G)**alpha)
-        dT_dG = alpha * G**(alpha-1) * (1-G)**(alpha-1) / (G**alpha + (1-G)**alpha)**2
-        
-        return (np.pi/2) * np.cos((np.pi/2) * T) * dT_dG * g
+        x = np.asarray(x, dtype=float)
+        inside = x > 0
+
+        log_z = k * np.log(x/lam)
+        z = np.exp(log_z)
+        G = -np.expm1(-z)
+        # Where z underflows, G ~ z: fall back to log z and z/G = 1
+        log_G = np.where(G > 0, np.log(G), log_z)
+        z_over_G = np.where(G > 0, z / G, 1.0)
+
+        # log-odds of (1-T) against T; T and v = 1 - T both without cancellation
+        # log(1-G) is exactly -z, so w needs no log of 1-G
+        w = -alpha * (z + log_G)
+        del G
+        T = expit(-w)
+        v = expit(w)
+
+        out = {}
+        if "cdf" in which:
+            out["cdf"] = np.where(inside, np.sin((np.pi/2) * T), 0.0)
+        if "sf" in which:
+            # 1 - sin(pi/2 T) = 2 sin^2(pi/4 (1-T))
+            out["sf"] = np.where(inside, 2 * np.sin((np.pi/4) * v)**2, 1.0)
+        if "pdf" in which or "hazard" in which:
+            # dT/dG * g(x) = alpha T (1-T) k z / (G x); core omits the (1-T)
+            core = alpha * k * T * z_over_G / x
+        if "pdf" in which:
+            pdf = (np.pi/2) * np.sin((np.pi/2) * v) * v * core
+            # Where z overflows, core is inf (or inf/inf at x = inf) while v is 0
+            out["pdf"] = np.where(inside & (v > 0), pdf, 0.0)
+        if "hazard" in which:
+            # pdf/sf reduces to core * v / tan(pi/4 v), whose limit as v -> 0 is 4/pi
+            ratio = np.where(v > 0, v / np.tan((np.pi/4) * v), 4/np.pi)
+            out["hazard"] = np.where(inside, (np.pi/2) * core * ratio, 0.0)
+        if "logsf" in which or "cumhazard" in which:
+            # -log1p(-F) in the body, 2 log sin(pi/4 (1-T)) + log 2 in the upper tail
+            log_v = -np.logaddexp(0, -w)
+            log_sf_tail = np.log(2) + 2 * (np.log(np.pi/4) + log_v + np.log(np.sinc(v/4)))
+            log_sf = np.where(T < 0.5, np.log1p(-np.sin((np.pi/2) * T)), log_sf_tail)
+            log_sf = np.where(inside, log_sf, 0.0)
+            if "logsf" in which:
+                out["logsf"] = log_sf
+            if "cumhazard" in which:
+                out["cumhazard"] = -log_sf
+        if "logcdf" in which:
+            # log sin(pi/2 T) in the lower tail, log1p(-sf) in the upper tail
+            log_T = -np.logaddexp(0, w)
+            log_cdf_head = np.log(np.pi/2) + log_T + np.log(np.sinc(T/2))
+            log_cdf = np.where(T < 0.5, log_cdf_head, np.log1p(-2 * np.sin((np.pi/4) * v)**2))
+            out["logcdf"] = np.where(inside, log_cdf, -np.inf)
+        if "logpdf" in which:
+            # log[(pi/2) sin(pi/2 (1-T)) alpha T (1-T) k z / (G x)], with sin(u) = u sinc(u/pi)
+            log_T = -np.logaddexp(0, w)
+            log_v = -np.logaddexp(0, -w)
+            logpdf = (2 * np.log(np.pi/2) + np.log(alpha * k) + 2 * log_v + np.log(np.sinc(v/2))
+                      + log_T + log_z - log_G - np.log(x))
+            # w = -inf (z overflowed) leaves inf - inf above; the density is 0 there
+            out["logpdf"] = np.where(inside & (w > -np.inf), logpdf, -np.inf)
+        return {name: val[()] if val.ndim == 0 else val for name, val in out.items()}
+
+def stiiHLW_pdf(x, lam, k, alpha):
+    """STIIHL Weibull probability density function"""
+    return stiiHLW_eval(x, lam, k, alpha, ("pdf",))["pdf"]
 
 def stiiHLW_cdf(x, lam, k, alpha):
     """STIIHL Weibull cumulative distribution function"""
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        G = weibull_cdf(x, lam, k)
-        
-        # Handle edge cases
-        G = np.clip(G, 1e-15, 1-1e-15)
-        
-        T = G**alpha / (G**alpha + (1-G)**alpha)
-        return np.sin((np.pi/2) * T)
+    return stiiHLW_eval(x, lam, k, alpha, ("cdf",))["cdf"]
 
 def stiiHLW_sf(x, lam, k, alpha):
     """STIIHL Weibull survival function"""
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        return 1 - stiiHLW_cdf(x, lam, k, alpha)
+    return stiiHLW_eval(x, lam, k, alpha, ("sf",))["sf"]
 
 def stiiHLW_hazard(x, lam, k, alpha):
     """STIIHL Weibull hazard function"""
+    return stiiHLW_eval(x, lam, k, alpha, ("hazard",))["hazard"]
+
+def stiiHLW_cumhazard(x, lam, k, alpha):
+    """STIIHL Weibull cumulative hazard function"""
+    return stiiHLW_eval(x, lam, k, alpha, ("cumhazard",))["cumhazard"]
+
+def stiiHLW_logpdf(x, lam, k, alpha):
+    """STIIHL Weibull log-density, evaluated directly in log space"""
+    return stiiHLW_eval(x, lam, k, alpha, ("logpdf",))["logpdf"]
+
+def stiiHLW_logcdf(x, lam, k, alpha):
+    """STIIHL Weibull log-CDF, evaluated directly in log space"""
+    return stiiHLW_eval(x, lam, k, alpha, ("logcdf",))["logcdf"]
+
+def stiiHLW_logsf(x, lam, k, alpha):
+    """STIIHL Weibull log-survival function, evaluated directly in log space"""
+    return stiiHLW_eval(x, lam, k, alpha, ("logsf",))["logsf"]
+
+def stiiHLW_quantile(p, lam, k, alpha):
+    """STIIHL Weibull quantile function (inverse CDF)
+
+    Closed-form inversion of the CDF: arcsin undoes the sine generator,
+    the TIIHL odds ratio is inverted for G, and the Weibull inverse maps
+    G back to x. Accepts arrays of any shape and broadcasts over the
+    parameters; p=0 maps to 0, p=1 to inf and p outside [0, 1] to nan.
+    """
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        pdf = stiiHLW_pdf(x, lam, k, alpha)
-        sf = stiiHLW_sf(x, lam, k, alpha)
-        return np.where(sf > 0, pdf/sf, 0)
+        p = np.asarray(p, dtype=float)
 
-def stiiHLW_quantile(p, lam, k, alpha):
-    """STIIHL Weibull quantile function (inverse CDF)"""
-    if p <= 0:
-        return 0
-    if p >= 1:
-        return np.inf
-    
-    # Numerically solve for x such that CDF(x) = p
-    from scipy.optimize import brentq
-    
-    def func(x):
-        return stiiHLW_cdf(np.array([x]), lam, k, alpha)[0] - p
-    
-    try:
-        # Find reasonable bounds
-        max_iter = 100
-        upper = lam * (-np.log(1e-10))**(1/k) * 10
-        return brentq(func, 0, upper)
-    except:
-        return np.nan
-
-def mle_stiiHLW(data):
-    """Maximum Likelihood Estimation for STIIHL Weibull"""
-    def neg_log_likelihood(params):
-        lam, k, alpha = params
-        if lam <= 0 or k <= 0 or alpha <= 0:
-            return np.inf
-        pdf_vals = stiiHLW_pdf(data, lam, k, alpha)
-        pdf_vals = np.clip(pdf_vals, 1e-15, None)
-        return -np.sum(np.log(pdf_vals))
-    
-    # Initial guesses based on data
-    initial_lam = np.mean(data)
-    initial_k = 2.0
-    initial_alpha = 1.0
-    
-    bounds = [(0.1, 10*np.max(data)), (0.1, 10), (0.1, 10)]
-    result = minimize(neg_log_likelihood, 
-                     [initial_lam, initial_k, initial_alpha],
-                     bounds=bounds,
-                     method='L-BFGS-B')
-    
-    if result.success:
-        return result.x
-    else:
-        return [initial_lam, initial_k, initial_alpha]
+        # T = (2/pi) arcsin(p); 1 - T via arccos keeps the upper tail accurate
+        x = _quantile_from_angles(np.arcsin(p), np.arccos(p), lam, k, alpha)
+        x = np.where(p <= 0, 0.0, x)
+        x = np.where(p >= 1, np.inf, x)
+        x = np.where((p < 0) | (p > 1) | np.isnan(p), np.nan, x)
+        return x[()] if x.ndim == 0 else x
+
+stiiHLW_ppf = stiiHLW_quantile
+
+def _quantile_from_angles(t, t_c, lam, k, alpha):
+    """Invert the CDF given (pi/2) T and (pi/2) (1 - T)"""
+    # Odds of G: G/(1-G) = (T/(1-T))**(1/alpha), so -log(1-G) = log1p(odds);
+    # kept in log space, since the odds overflow deep in the upper tail
+    log_odds = (np.log(t) - np.log(t_c)) / alpha
+    z = np.logaddexp(0, log_odds)
+    return lam * z**(1/k)
+
+def stiiHLW_isf(q, lam, k, alpha):
+    """STIIHL Weibull inverse survival function, x with S(x) = q
+
+    Works from q directly, so upper-tail probabilities far below machine
+    epsilon keep full precision (``stiiHLW_quantile(1 - q)`` would not).
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        q = np.asarray(q, dtype=float)
+
+        # arccos(1 - q) = 2 arcsin(sqrt(q/2)) without forming 1 - q
+        t_c = 2 * np.arcsin(np.sqrt(q / 2))
+        x = _quantile_from_angles(np.pi/2 - t_c, t_c, lam, k, alpha)
+        x = np.where(q >= 1, 0.0, x)
+        x = np.where(q <= 0, np.inf, x)
+        x = np.where((q < 0) | (q > 1) | np.isnan(q), np.nan, x)
+        return x[()] if x.ndim == 0 else x
+
+def _panel_rule(n_nodes, n_panels):
+    """Gauss-Legendre nodes and weights on the panels [2**-(j+1), 2**-j], j = 1..n_panels
+
+    Geometric panels resolve the endpoint behaviour of Q(u) (a power of u
+    near 0, a power of log(1/q) near 1) with a fixed number of nodes each.
+    """
+    t, w = np.polynomial.legendre.leggauss(n_nodes)
+    right = 2.0**-np.arange(1, n_panels + 1)[:, None]
+    half = right / 4
+    return (right - half * (1 - t)).ravel(), (half * w).ravel()
+
+# Lower half in u down to 2**-64 (the rest is below rounding); upper half in
+# q = 1 - u down to 2**-1024, the edge of double precision
+_MOMENT_NODES = {n: (_panel_rule(n, 64), _panel_rule(n, 1023)) for n in (8, 16)}
+
+@lru_cache(maxsize=4096)
+def _unit_moments(k, alpha, orders):
+    """Raw moments at lam = 1 with error estimates, cached by (k, alpha, orders)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        r = np.asarray(orders, dtype=float)[:, None]
+        estimates = []
+        for n in (8, 16):
+            (u, wu), (q, wq) = _MOMENT_NODES[n]
+            lower = stiiHLW_quantile(u, 1.0, k, alpha)
+            upper = stiiHLW_isf(q, 1.0, k, alpha)
+            estimates.append(np.sum(wu * lower**r, axis=1) + np.sum(wq * upper**r, axis=1))
+        coarse, fine = estimates
+        return tuple(fine), tuple(np.abs(fine - coarse))
+
+def stiiHLW_moments(lam, k, alpha, orders=(1, 2, 3, 4)):
+    """Raw moments E[X**r] with error estimates
+
+    Integrates E[X**r] = int_0^1 Q(u)**r du with fixed 16-node
+    Gauss-Legendre rules on geometric panels toward both ends (the upper
+    half through ``stiiHLW_isf``), so there is no x-grid to truncate the
+    tail. The error estimate is the difference from the 8-node rule on
+    the same panels, which bounds the 16-node error. Results are cached
+    by (k, alpha, orders) at unit scale and multiplied by lam**r, so
+    repeated calls cost a dictionary lookup. Returns (moments, errors).
+    """
+    orders = tuple(int(r) for r in np.atleast_1d(orders))
+    unit, err = _unit_moments(float(k), float(alpha), orders)
+    scale = float(lam)**np.array(orders, dtype=float)
+    return scale * np.array(unit), scale * np.array(err)
+
+def _summary_from_raw(m1, m2, m3, m4):
+    """Mean, variance, skewness and excess kurtosis from raw moments"""
+    var = m2 - m1**2
+    return {
+        'mean': m1,
+        'variance': var,
+        'std': np.sqrt(var),
+        'skewness': (m3 - 3*m1*var - m1**3) / var**1.5,
+        'kurtosis': (m4 - 4*m1*m3 + 6*m1**2*m2 - 3*m1**4) / var**2 - 3,
+    }
+
+def stiiHLW_stats(lam, k, alpha):
+    """Mean, variance, std, skewness and excess kurtosis as a dict"""
+    return _summary_from_raw(*stiiHLW_moments(lam, k, alpha)[0])
+
+def weibull_stats(lam, k):
+    """Weibull mean, variance, std, skewness and excess kurtosis as a dict"""
+    return _summary_from_raw(*(lam**r * gamma(1 + r/k) for r in range(1, 5)))
+
+HAZARD_SHAPES = ("increasing", "decreasing", "bathtub", "upside-down bathtub", "other")
+
+def _shape_grid(k, alpha, n=2000):
+    """Unit-scale x-grid from the 1e-10 to the 1 - 1e-10 quantile, uniform in log x
+
+    The lower end is floored at 1e-300; below it the density is a pure
+    power of x, so nothing about its shape is lost.
+    """
+    lo = max(stiiHLW_quantile(1e-10, 1.0, k, alpha), 1e-300)
+    hi = stiiHLW_isf(1e-10, 1.0, k, alpha)
+    return np.geomspace(lo, hi, n)
+
+def stiiHLW_mode(lam, k, alpha):
+    """Mode of the density (0 when the density is largest at the origin)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        x = _shape_grid(k, alpha)
+        logpdf = stiiHLW_logpdf(x, 1.0, k, alpha)
+        i = int(np.argmax(logpdf))
+        if i == 0:
+            return 0.0
+        lower, upper = x[i - 1], x[min(i + 1, len(x) - 1)]
+        res = minimize(lambda y: -stiiHLW_logpdf(np.exp(y[0]), 1.0, k, alpha),
+                       [np.log(x[i])], method='L-BFGS-B',
+                       bounds=[(np.log(lower), np.log(upper))], options={'ftol': 1e-15})
+        return lam * float(np.exp(res.x[0]))
+
+def stiiHLW_hazard_shape(k, alpha):
+    """Shape of the hazard rate, one of HAZARD_SHAPES (free of lam)
+
+    Counts sign changes of the slope of log h over the central 1 - 2e-10
+    of the mass; slopes within rounding of zero are skipped.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        funcs = stiiHLW_eval(_shape_grid(k, alpha), 1.0, k, alpha, ("logpdf", "logsf"))
+        slope = np.diff(funcs["logpdf"] - funcs["logsf"])
+        sign = np.sign(slope[np.abs(slope) > 1e-9])
+    turns = sign[1:] != sign[:-1]
+    if sign.size == 0 or turns.sum() > 1:
+        return "other"
+    if not turns.any():
+        return "increasing" if sign[0] > 0 else "decreasing"
+    return "bathtub" if sign[0] < 0 else "upside-down bathtub"
+
+def stiiHLW_loglik(data, lam, k, alpha, deriv=0, weights=None):
+    """STIIHL Weibull log-likelihood with optional analytic derivatives
+
+    Returns the log-likelihood summed over the last axis of ``data``;
+    with ``deriv=1`` also the score vector and with ``deriv=2`` also the
+    Hessian, both with respect to (lam, k, alpha), from the same pass.
+    Parameters shaped (..., 1) fit stacked datasets in one call, giving
+    results with a trailing dataset axis. ``weights`` (same shape as
+    ``data``) multiplies each term; zero-weight entries must still hold a
+    positive placeholder value.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        x = np.asarray(data, dtype=float)
+
+        # Sums keep the reduced axis so they broadcast against (..., 1) parameters
+        if weights is None:
+            n = x.shape[-1]
+            def total(a):
+                return np.sum(a, axis=-1, keepdims=True)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            n = np.sum(weights, axis=-1, keepdims=True)
+            def total(a):
+                return np.sum(a * weights, axis=-1, keepdims=True)
+
+        log_x = np.log(x)
+        L = log_x - np.log(lam)
+        z = np.exp(k * L)
+        G = -np.expm1(-z)
+        log_G = np.where(G > 0, np.log(G), k * L)
+        w = -alpha * (z + log_G)
+        T = expit(-w)
+        v = expit(w)
+        sinc_v = np.sinc(v/2)
+
+        # l = log(pi/2) + log(alpha k) + log z - log G - log x + psi(w), with
+        # psi(w) = log T + log v + log sin(pi/2 v); log v = log T + w and
+        # log sin(pi/2 v) = log(pi/2) + log v + log sinc(v/2)
+        log_T = -np.logaddexp(0, w)
+        psi = 3 * log_T + 2 * w + np.log(sinc_v)
+        ll = (n * (2 * np.log(np.pi/2) + np.log(alpha * k))
+              + total(k * L - log_G - log_x + psi))
+        if deriv == 0:
+            return ll[..., 0][()]
+
+        # psi'(w) = T - v + r T with r = (pi/2) v cot(pi/2 v), r -> 1 as v -> 0
+        r = np.cos((np.pi/2) * v) / sinc_v
+        d_psi = T - v + r * T
+
+        # q = d log G / dz = 1/(e^z - 1); phi(z, alpha) = -log G + psi(w)
+        q = 1 / np.expm1(z)
+        w_z = -alpha * (1 + q)
+        w_a = -(z + log_G)
+        phi_z = -q + d_psi * w_z
+        phi_a = d_psi * w_a
+
+        # dz/dlam = -(k/lam) z and dz/dk = z L
+        phi_z_z = phi_z * z
+        sum_L = total(L)
+        sum_phi_z_z = total(phi_z_z)
+        sum_phi_z_zL = total(phi_z_z * L)
+        grad = np.stack([
+            -(k/lam) * (n + sum_phi_z_z),
+            n/k + sum_L + sum_phi_z_zL,
+            n/alpha + total(phi_a),
+        ])
+        if deriv == 1:
+            return ll[..., 0][()], grad[..., 0]
+
+        d2_psi = -2 * v * T + r * T * (T - v) - (T / sinc_v)**2
+        dq = -q * (1 + q)
+        phi_zz_z2 = (-dq + d2_psi * w_z**2 - alpha * dq * d_psi) * z**2
+        phi_za_z = (d2_psi * w_z * w_a - (1 + q) * d_psi) * z
+        phi_aa = d2_psi * w_a**2
+
+        # d2z/dlam2 = k(k+1) z/lam^2, d2z/dlam dk = -(z/lam)(1 + k L), d2z/dk2 = z L^2
+        sum_zz = total(phi_zz_z2)
+        sum_zzL = total(phi_zz_z2 * L)
+        sum_zzL2 = total(phi_zz_z2 * L**2)
+        sum_phi_z_zL2 = total(phi_z_z * L**2)
+        h_ll = (n * k/lam**2 + (k/lam)**2 * sum_zz + k * (k + 1) / lam**2 * sum_phi_z_z)
+        h_lk = (-n/lam - (k/lam) * sum_zzL - (sum_phi_z_z + k * sum_phi_z_zL) / lam)
+        h_la = -(k/lam) * total(phi_za_z)
+        h_kk = -n/k**2 + sum_zzL2 + sum_phi_z_zL2
+        h_ka = total(phi_za_z * L)
+        h_aa = -n/alpha**2 + total(phi_aa)
+        hess = np.stack([
+            np.stack([h_ll, h_lk, h_la]),
+            np.stack([h_lk, h_kk, h_ka]),
+            np.stack([h_la, h_ka, h_aa]),
+        ])
+        return ll[..., 0][()], grad[..., 0], hess[..., 0]
+
+class FitResult:
+    """Result of a STIIHL Weibull maximum likelihood fit
+
+    Carries the estimates, the log-likelihood and the observed Fisher
+    information (minus the analytic Hessian) at the MLE, from which
+    standard errors, the covariance matrix and Wald intervals follow.
+    Unpacks like the (lam, k, alpha) tuple returned by ``mle_stiiHLW``.
+    Fitting strategies may record diagnostics in ``details``.
+    """
+    names = ('lam', 'k', 'alpha')
+
+    def __init__(self, params, loglik, information, success=True, nit=0, message='',
+                 details=None):
+        self.params = np.asarray(params, dtype=float)
+        self.loglik = loglik
+        self.information = np.asarray(information, dtype=float)
+        self.success = success
+        self.nit = nit
+        self.message = message
+        self.details = {} if details is None else details
+
+    def __iter__(self):
+        return iter(self.params)
+
+    def __len__(self):
+        return len(self.params)
+
+    def __getitem__(self, i):
+        return self.params[i]
+
+    def __repr__(self):
+        est = ', '.join(f'{n}={p:.6g}' for n, p in zip(self.names, self.params))
+        return f'FitResult({est}, loglik={self.loglik:.6g}, success={self.success})'
+
+    @property
+    def covariance(self):
+        """Asymptotic covariance: inverse of the observed information"""
+        try:
+            return np.linalg.inv(self.information)
+        except np.linalg.LinAlgError:
+            return np.full((3, 3), np.nan)
+
+    @property
+    def standard_errors(self):
+        """Asymptotic standard errors of (lam, k, alpha)"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return np.sqrt(np.diag(self.covariance))
+
+    def confidence_intervals(self, level=0.95, scale='log'):
+        """Wald intervals, as a (3, 2) array of [lower, upper] rows
+
+        ``scale='log'`` builds the interval for log(theta) and maps it back,
+        which keeps the bounds positive; ``scale='linear'`` is plain Wald.
+        """
+        from scipy.stats import norm
+        z = norm.ppf(0.5 + level/2)
+        se = self.standard_errors
+        if scale == 'log':
+            half = z * se / self.params
+            return np.column_stack([self.params * np.exp(-half), self.params * np.exp(half)])
+        elif scale == 'linear':
+            return np.column_stack([self.params - z*se, self.params + z*se])
+        raise ValueError(f"scale must be 'log' or 'linear', got {scale!r}")
+
+def _cdf_derivatives(x, lam, k, alpha):
+    """CDF, survival and the CDF gradient w.r.t. (lam, k, alpha) at x
+
+    Exact at the support edges: x <= 0 gives F = 0 and x = inf gives F = 1,
+    both with zero gradient.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        x = np.asarray(x, dtype=float)
+        inside = (x > 0) & np.isfinite(x)
+        xs = np.where(inside, x, 1.0)
+
+        L = np.log(xs/lam)
+        z = np.exp(k * L)
+        G = -np.expm1(-z)
+        log_G = np.where(G > 0, np.log(G), k * L)
+        w = -alpha * (z + log_G)
+        T = expit(-w)
+        v = expit(w)
+
+        edge = np.where(x > 0, 1.0, 0.0)
+        F = np.where(inside, np.sin((np.pi/2) * T), edge)
+        S = np.where(inside, 2 * np.sin((np.pi/4) * v)**2, 1 - edge)
+
+        # dF/dw = -(pi/2) cos(pi/2 T) T (1-T), then chain through z and alpha
+        dF_dw = -(np.pi/2) * np.sin((np.pi/2) * v) * v * T
+        w_z = -alpha * (1 + 1 / np.expm1(z))
+        dF = np.stack([
+            dF_dw * w_z * (-k * z / lam),
+            dF_dw * w_z * z * L,
+            dF_dw * -(z + log_G),
+        ])
+        return F, S, np.where(inside, dF, 0.0)
+
+def stiiHLW_interval_loglik(lower, upper, counts, lam, k, alpha, deriv=0):
+    """Log-likelihood of ``counts`` observations falling in (lower, upper]
+
+    Each interval contributes counts * log(F(upper) - F(lower)); the
+    difference is taken on the survival function in the upper half so
+    tail bins keep their precision. ``deriv=1`` adds the analytic score.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        counts = np.asarray(counts, dtype=float)
+        F_a, S_a, dF_a = _cdf_derivatives(lower, lam, k, alpha)
+        F_b, S_b, dF_b = _cdf_derivatives(upper, lam, k, alpha)
+        P = np.where(F_a < 0.5, F_b - F_a, S_a - S_b)
+
+        occupied = counts > 0
+        ll = np.sum(np.where(occupied, counts * np.log(P), 0.0))
+        if deriv == 0:
+            return ll
+
+        grad = np.sum(np.where(occupied, counts * (dF_b - dF_a) / P, 0.0), axis=-1)
+        return ll, grad
+
+EXACT, RIGHT_CENSORED, LEFT_CENSORED, INTERVAL_CENSORED = 0, 1, 2, 3
+
+def stiiHLW_censored_loglik(data, censoring, lam, k, alpha, deriv=0, upper=None,
+                            weights=None):
+    """Log-likelihood of exact and censored observations
+
+    ``censoring`` codes each value of ``data``: EXACT (0) contributes
+    log f(x), RIGHT_CENSORED (1, still running at x) log S(x),
+    LEFT_CENSORED (2, failed before x) log F(x) and INTERVAL_CENSORED (3)
+    log(F(upper) - F(x)) with the right end taken from ``upper``. Each
+    group is evaluated in one vectorized pass, the one-sided groups on the
+    log-survival and log-CDF kernels; ``deriv=1`` adds the analytic score
+    from a single pass of F, S and dF for both. ``weights`` are frequency
+    counts per row.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        x = np.asarray(data, dtype=float)
+        censoring = np.broadcast_to(np.asarray(censoring), x.shape)
+        w = np.ones_like(x) if weights is None else np.asarray(weights, dtype=float)
 
-def goodness_of_fit(data, lam, k, alpha):
-    """Calculate goodness of fit statistics"""
+        ll = 0.0
+        grad = np.zeros(3)
+        exact = censoring == EXACT
+        if np.any(exact):
+            part = stiiHLW_loglik(x[exact], lam, k, alpha, deriv=deriv, weights=w[exact])
+            ll, grad = (part, grad) if deriv == 0 else (part[0], part[1])
+
+        one_sided = (censoring == RIGHT_CENSORED) | (censoring == LEFT_CENSORED)
+        if deriv == 0:
+            right = censoring == RIGHT_CENSORED
+            left = censoring == LEFT_CENSORED
+            if np.any(right):
+                ll = ll + np.sum(w[right] * stiiHLW_logsf(x[right], lam, k, alpha))
+            if np.any(left):
+                ll = ll + np.sum(w[left] * stiiHLW_logcdf(x[left], lam, k, alpha))
+        elif np.any(one_sided):
+            # One CDF pass gives both groups and the score: S and F with dF
+            F, S, dF = _cdf_derivatives(x[one_sided], lam, k, alpha)
+            right = censoring[one_sided] == RIGHT_CENSORED
+            wc = w[one_sided]
+            P = np.where(right, S, F)
+            ll = ll + np.sum(wc * np.log(P))
+            grad = grad + np.sum(np.where(right, -1.0, 1.0) * wc * dF / P, axis=-1)
+
+        interval = censoring == INTERVAL_CENSORED
+        if np.any(interval):
+            b = np.broadcast_to(np.asarray(upper, dtype=float), x.shape)[interval]
+            part = stiiHLW_interval_loglik(x[interval], b, w[interval], lam, k, alpha,
+                                           deriv=min(deriv, 1))
+            ll, grad = (ll + part, grad) if deriv == 0 else (ll + part[0], grad + part[1])
+
+        return ll if deriv == 0 else (ll, grad)
+
+def _kaplan_meier(times, events, weights=None):
+    """Kaplan-Meier estimate of F at the distinct event times (vectorized)
+
+    Ties put events before censorings, as usual; frequency ``weights``
+    count as that many tied rows.
+    """
+    times = np.asarray(times, dtype=float)
+    events = np.asarray(events, dtype=bool)
+    w = np.ones_like(times) if weights is None else np.asarray(weights, dtype=float)
+    order = np.lexsort((~events, times))
+    times, events, w = times[order], events[order], w[order]
+    at_risk = np.sum(w) - np.concatenate([[0.0], np.cumsum(w)[:-1]])
+    hazard = np.where(events, w / at_risk, 0.0)
+    with np.errstate(divide="ignore"):
+        survival = np.exp(np.cumsum(np.log1p(-np.minimum(hazard, 1.0))))
+    # Report the estimate at the end of each distinct time that has events
+    group_end = np.append(times[1:] != times[:-1], True)
+    n_events = np.cumsum(events)[group_end]
+    keep = np.diff(np.concatenate([[0], n_events])) > 0
+    return times[group_end][keep], 1 - survival[group_end][keep]
+
+def _numerical_information(score, params):
+    """Observed information by central differences of an analytic score"""
+    params = np.asarray(params, dtype=float)
+    info = np.empty((3, 3))
+    for i in range(3):
+        h = 1e-5 * max(abs(params[i]), 1.0)
+        step = np.zeros(3)
+        step[i] = h
+        info[:, i] = -(score(params + step) - score(params - step)) / (2*h)
+    return (info + info.T) / 2
+
+def frequency_table(data, decimals=None):
+    """Distinct values and their counts, optionally after rounding
+
+    The (values, counts) pair can be passed as ``data`` and ``weights`` to
+    the fitting functions, whose cost then scales with the number of
+    distinct values rather than the number of rows.
+    """
+    data = np.asarray(data, dtype=float)
+    if decimals is not None:
+        data = np.round(data, decimals)
+    return np.unique(data, return_counts=True)
+
+def _initial_guess(x, p):
+    """Starting (lam, k, alpha) from points (x, p) of the empirical CDF
+
+    Inverting F = sin(pi*T/2) gives logit(T) = alpha * logit(G), and for
+    the Weibull G, log(-log(1-G)) is linear in log(x) with slope k. The
+    shape alpha is profiled over a grid by the probability-plot
+    correlation of that line, k is its slope, and lam matches the central
+    quantiles in log space.
+    """
+    x = np.asarray(x, dtype=float)
+    p = np.asarray(p, dtype=float)
+    keep = (x > 0) & np.isfinite(x) & (p > 0) & (p < 1)
+    x, p = x[keep], p[keep]
+    if len(np.unique(x)) < 3:
+        center = np.mean(x) if len(x) else 1.0
+        return center, 2.0, 1.0
+
+    log_x = np.log(x)
+    T = np.arcsin(p) / (np.pi/2)
+    logit_T = np.log(T) - np.log1p(-T)
+
+    # y = log(-log(1 - G)) with logit(G) = logit(T)/alpha, for every alpha at once
+    alphas = np.geomspace(0.05, 20, 61)[:, None]
+    y = np.log(np.logaddexp(0, logit_T / alphas))
+    u = log_x - np.mean(log_x)
+    yc = y - np.mean(y, axis=1, keepdims=True)
+    slope = (yc @ u) / (u @ u)
+    corr = (yc @ u) / np.sqrt(np.sum(yc**2, axis=1) * (u @ u))
+    best = np.argmax(np.where(slope > 0, corr, -np.inf))
+    alpha = alphas[best, 0]
+    k = slope[best]
+
+    central = (p > 0.1) & (p < 0.9)
+    if np.count_nonzero(central) < 3:
+        central = np.ones_like(p, dtype=bool)
+    unit = stiiHLW_quantile(p[central], 1.0, k, alpha)
+    lam = np.exp(np.mean(log_x[central] - np.log(unit)))
+    return lam, k, alpha
+
+def stiiHLW_initial_guess(data=None, weights=None, bins=None, n_points=200,
+                          censoring=None, upper=None):
+    """Data-driven starting (lam, k, alpha) for the likelihood fit
+
+    Uses up to ``n_points`` empirical quantiles of ``data`` (of a strided
+    subset of about 50,000 values for larger samples), weighted by
+    frequency ``weights`` if given, or the cumulative proportions at the
+    edges for ``bins=(edges, counts)``; see ``_initial_guess``. With
+    ``censoring`` codes the points come from the Kaplan-Meier estimate,
+    counting left-censored values as failures at x and interval-censored
+    ones as failures at the midpoint.
+    """
+    if bins is not None:
+        edges, counts = bins
+        counts = np.asarray(counts, dtype=float)
+        return _initial_guess(np.asarray(edges, dtype=float)[1:],
+                              np.cumsum(counts) / np.sum(counts))
+
+    if censoring is not None:
+        data = np.asarray(data, dtype=float).reshape(-1)
+        censoring = np.broadcast_to(np.asarray(censoring), data.shape).reshape(-1)
+        if upper is not None:
+            upper = np.broadcast_to(np.asarray(upper, dtype=float), data.shape).reshape(-1)
+            data = np.where(censoring == INTERVAL_CENSORED, (data + upper) / 2, data)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float).reshape(-1)
+        times, F = _kaplan_meier(data, censoring != RIGHT_CENSORED, weights)
+        if len(times) == 0:
+            return _initial_guess(data, np.full(data.shape, 0.5))
+        # Plotting positions over the range the estimate reaches
+        grid = F[-1] * (np.arange(1, n_points + 1) - 0.3) / (n_points + 0.4)
+        return _initial_guess(np.interp(grid, F, times), grid)
+
+    data = np.asarray(data, dtype=float).reshape(-1)
     n = len(data)
+    if weights is None:
+        # Quantiles of an evenly strided subset are plenty for a start point
+        data = data[::max(1, n // 50_000)]
+        n = len(data)
+        m = min(n, n_points)
+        p = (np.arange(1, m + 1) - 0.3) / (m + 0.4)
+        return _initial_guess(np.quantile(data, p), p)
+
+    weights = np.asarray(weights, dtype=float).reshape(-1)
+    order = np.argsort(data)
+    cum = np.cumsum(weights[order])
+    total = cum[-1]
+    # Plotting positions at the middle of each value's share of the weight
+    p = (cum - weights[order] / 2) / total
+    if n > n_points:
+        grid = (np.arange(1, n_points + 1) - 0.5) / n_points
+        return _initial_guess(np.interp(grid, p, data[order]), grid)
+    return _initial_guess(data[order], p)
+
+def _check_support(data, censoring=None):
+    """Raise ValueError unless every exact observation lies in (0, inf)"""
+    data = np.asarray(data, dtype=float)
+    exact = np.ones(data.shape, dtype=bool)
+    if censoring is not None:
+        exact = np.broadcast_to(np.asarray(censoring), data.shape) == EXACT
+    bad = exact & ~((data > 0) & np.isfinite(data))
+    if bad.any():
+        raise ValueError(f"{np.count_nonzero(bad)} observation(s) outside the support (0, inf), "
+                         f"e.g. {data[bad].flat[0]:g}; drop or shift them before fitting")
+
+def _to_log_params(theta, grad, hess):
+    """Chain-rule score and Hessian from (lam, k, alpha) to their logs
+
+    Works on single (3,) / (3, 3) inputs or stacks of shape (B, 3) / (B, 3, 3).
+    """
+    grad_eta = grad * theta
+    hess_eta = hess * theta[..., :, None] * theta[..., None, :]
+    hess_eta[..., np.arange(3), np.arange(3)] += grad_eta
+    return grad_eta, hess_eta
+
+def _rescale_fit(fit, scale, n_density):
+    """Map a fit to data divided by ``scale`` back to the original units
+
+    lam scales with the data and the covariance with it; each of the
+    ``n_density`` density terms gains the Jacobian -log(scale), while
+    probabilities (binned or censored terms) are unit-free.
+    """
+    jac = np.array([scale, 1.0, 1.0])
+    loglik = fit.loglik - n_density * np.log(scale)
+    return FitResult(fit.params * jac, loglik, fit.information / np.outer(jac, jac),
+                     success=fit.success, nit=fit.nit, message=fit.message,
+                     details=fit.details)
+
+def _maximize_loglik(loglik, start, n_obs=1, method='L-BFGS-B', exact_hessian=True):
+    """Fit (lam, k, alpha) by maximizing ``loglik(params, deriv)``
+
+    ``loglik`` returns the log-likelihood, plus the score for deriv=1 and
+    the Hessian for deriv=2 (only requested when ``exact_hessian``;
+    otherwise the score is differenced). The search is unconstrained over
+    eta = log(params / start) on the log-likelihood per observation
+    (``n_obs``), so positivity needs no bounds and the optimizer's steps
+    and tolerances do not depend on the data units or size.
+    """
+    deriv = 2 if method == 'trust-constr' and exact_hessian else 1
+    start = np.asarray(start, dtype=float)
+
+    # Log-likelihood, score and Hessian come from one pass; keep the last one
+    cache = {}
+    def evaluate(eta):
+        key = tuple(eta)
+        if key not in cache:
+            cache.clear()
+            cache[key] = loglik(start * np.exp(eta), deriv)
+        return cache[key]
+
+    def neg_log_likelihood(eta):
+        ll, grad = evaluate(eta)[:2]
+        if not np.isfinite(ll):
+            return np.inf, np.zeros(3)
+        return -ll / n_obs, -grad * start * np.exp(eta) / n_obs
+
+    def score(params):
+        return loglik(params, 1)[1]
+
+    def neg_hessian(eta):
+        params = start * np.exp(eta)
+        if exact_hessian:
+            hess = evaluate(eta)[2]
+        else:
+            hess = -_numerical_information(score, params)
+        return -_to_log_params(params, score(params), hess)[1] / n_obs
+
+    # A non-finite start gives the optimizer a zero gradient, which it takes for convergence
+    if not np.isfinite(evaluate(np.zeros(3))[0]):
+        return FitResult(start, np.nan, np.full((3, 3), np.nan), success=False, nit=0,
+                         message="log-likelihood is not finite at the start")
+
+    result = minimize(neg_log_likelihood, np.zeros(3),
+                     jac=True,
+                     hess=neg_hessian if method == 'trust-constr' else None,
+                     method=method)
     
-    # Kolmogorov-Smirnov statistic
-    sorted_data = np.sort(data)
-    ecdf = np.arange(1, n+1) / n
-    tcdf = stiiHLW_cdf(sorted_data, lam, k, alpha)
-    ks_stat = np.max(np.abs(ecdf - tcdf))
+    params = start * np.exp(result.x) if result.success else start
+    if exact_hessian:
+        ll, _, hess = loglik(params, 2)
+        information = -hess
+    else:
+        ll = loglik(params, 0)
+        information = _numerical_information(score, params)
+    return FitResult(params, ll, information, success=result.success and np.isfinite(ll),
+                     nit=result.nit, message=str(result.message))
+
+def fit_stiiHLW(data=None, method='L-BFGS-B', x0=None, weights=None, bins=None,
+                censoring=None, upper=None):
+    """Maximum likelihood fit returning a FitResult
+
+    ``method`` is 'L-BFGS-B' (quasi-Newton on the analytic score) or
+    'trust-constr' (Newton trust region on the analytic score and Hessian).
+    ``x0`` overrides the data-driven start from ``stiiHLW_initial_guess``,
+    e.g. to warm-start. The data are divided by the starting lam and the
+    fit runs on unconstrained log-parameters; estimates, log-likelihood
+    and information are mapped back to the original units, so the
+    optimizer path does not depend on them.
+    ``weights`` are frequency counts for the values in ``data``; pre-binned
+    data is given instead as ``bins=(edges, counts)``, with the interval
+    likelihood built from CDF differences (the last edge may be inf).
+    Censored observations are marked by ``censoring`` codes, with the
+    right ends of interval-censored ones in ``upper``; see
+    ``stiiHLW_censored_loglik``.
+    On failure the initial guess is returned with ``success=False``.
+    Exact observations must be positive and finite (zero-weight entries
+    included); anything else raises ValueError.
+    """
+    if bins is None:
+        _check_support(data, censoring)
+    if x0 is None:
+        x0 = stiiHLW_initial_guess(data, weights, bins, censoring=censoring, upper=upper)
+    start = np.array(x0, dtype=float)
+    scale = start[0]
+    exact_hessian = bins is None and censoring is None
+
+    if bins is not None:
+        edges, counts = bins
+        edges = np.asarray(edges, dtype=float) / scale
+        counts = np.asarray(counts, dtype=float)
+        n_obs = np.sum(counts)
+        n_density = 0
+
+        def loglik(params, deriv):
+            return stiiHLW_interval_loglik(edges[:-1], edges[1:], counts, *params,
+                                           deriv=min(deriv, 1))
+
+    elif censoring is not None:
+        data = np.asarray(data, dtype=float) / scale
+        right_end = None if upper is None else np.asarray(upper, dtype=float) / scale
+        n_obs = data.size if weights is None else np.sum(weights)
+        exact = np.broadcast_to(np.asarray(censoring), data.shape) == EXACT
+        n_density = np.sum(exact) if weights is None else np.sum(np.asarray(weights)[exact])
+
+        def loglik(params, deriv):
+            return stiiHLW_censored_loglik(data, censoring, *params, deriv=min(deriv, 1),
+                                           upper=right_end, weights=weights)
+
+    else:
+        data = np.asarray(data, dtype=float) / scale
+        n_obs = data.size if weights is None else np.sum(weights)
+        n_density = n_obs
+
+        def loglik(params, deriv):
+            return stiiHLW_loglik(data, *params, deriv=deriv, weights=weights)
+
+    fit = _maximize_loglik(loglik, start / [scale, 1, 1], n_obs, method=method,
+                           exact_hessian=exact_hessian)
+    return _rescale_fit(fit, scale, n_density)
+
+def mle_stiiHLW(data=None, method='L-BFGS-B', x0=None, weights=None, bins=None,
+                censoring=None, upper=None):
+    """Maximum Likelihood Estimation for STIIHL Weibull"""
+    return fit_stiiHLW(data, method=method, x0=x0, weights=weights, bins=bins,
+                       censoring=censoring, upper=upper).params
+
+def goodness_of_fit(data, lam, k, alpha, weights=None, bins=None):
+    """Calculate goodness of fit statistics
+
+    ``weights`` are frequency counts for the values in ``data``; with
+    ``bins=(edges, counts)`` the statistics use the binned data instead
+    (``data`` is then ignored) and KS compares CDFs at the bin edges.
+    """
+    if bins is not None:
+        edges, counts = bins
+        edges = np.asarray(edges, dtype=float)
+        counts = np.asarray(counts, dtype=float)
+        n = np.sum(counts)
+        ecdf = np.cumsum(counts) / n
+        tcdf = stiiHLW_cdf(edges[1:], lam, k, alpha)
+        ks_stat = np.max(np.abs(ecdf - tcdf))
+        log_lik = -stiiHLW_interval_loglik(edges[:-1], edges[1:], counts, lam, k, alpha)
+    elif weights is not None:
+        data = np.asarray(data, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        n = np.sum(weights)
+        order = np.argsort(data)
+        ecdf = np.cumsum(weights[order]) / n
+        tcdf = stiiHLW_cdf(data[order], lam, k, alpha)
+        ks_stat = np.max(np.abs(ecdf - tcdf))
+        log_lik = -np.sum(weights * stiiHLW_logpdf(data, lam, k, alpha))
+    else:
+        n = len(data)
+        
+        # Kolmogorov-Smirnov statistic
+        sorted_data = np.sort(data)
+        ecdf = np.arange(1, n+1) / n
+        tcdf = stiiHLW_cdf(sorted_data, lam, k, alpha)
+        ks_stat = np.max(np.abs(ecdf - tcdf))
+        
+        log_lik = -np.sum(stiiHLW_logpdf(data, lam, k, alpha))
     
     # AIC and BIC
-    log_lik = -np.sum(np.log(stiiHLW_pdf(data, lam, k, alpha)))
     aic = 2 * 3 + 2 * log_lik  # 3 parameters
     bic = 3 * np.log(n) + 2 * log_lik
     
@@ -139,8 +908,330 @@ def goodness_of_fit(data, lam, k, alpha):
         'Log-Likelihood': -log_lik
     }
 
-def generate_stiiHLW_samples(n, lam, k, alpha):
+def stiiHLW_rvs(lam, k, alpha, size=None, random_state=None):
+    """Random variates by inverse-CDF transform of uniforms in bulk
+
+    ``random_state`` may be a ``numpy.random.Generator``, a seed or None.
+    """
+    rng = np.random.default_rng(random_state)
+    u = rng.random(size)
+    return stiiHLW_quantile(u, lam, k, alpha)
+
+def stiiHLW_rvs_chunks(n, lam, k, alpha, chunk_size=1_000_000, random_state=None):
+    """Yield ``n`` random variates in chunks of at most ``chunk_size``
+
+    Streams arbitrarily many draws with memory bounded by the chunk size.
+    """
+    rng = np.random.default_rng(random_state)
+    remaining = int(n)
+    while remaining > 0:
+        m = min(chunk_size, remaining)
+        yield stiiHLW_quantile(rng.random(m), lam, k, alpha)
+        remaining -= m
+
+def generate_stiiHLW_samples(n, lam, k, alpha, random_state=None):
     """Generate random samples from STIIHL Weibull distribution"""
-    u = np.random.uniform(0, 1, n)
-    samples = np.array([stiiHLW_quantile(p, lam, k, alpha) for p in u])
-    return samples
\ No newline at end of file
+    return stiiHLW_rvs(lam, k, alpha, size=n, random_state=random_state)
+
+class _OctaveTable:
+    """Piecewise polynomials on octave panels of v > 0, indexed by the bits of v
+
+    Each octave [2**(e-1), 2**e) for e in [e_min, e_max] is cut into
+    ``per_octave`` (a power of 2) equal panels, so the exponent and
+    leading mantissa bits of v, read off its IEEE 754 bit pattern, are the
+    panel index, with no search. Each function in ``funcs`` (a branch)
+    gets its own panels. The table uses the lowest
+    degree, then the fewest panels, that keep ``error(approx, exact)``
+    (default: the absolute difference) within ``tol`` at 33 points per
+    panel. Each branch's values must also increase (``directions`` entry
+    1, the default) or decrease (-1) through every panel's check points.
+    """
+    _CHECK = np.linspace(-1, 1, 33)
+
+    def __init__(self, funcs, e_min, e_max, tol, directions=None, error=None):
+        self.e_min, self.n_octaves = e_min, e_max - e_min + 1
+        self.funcs = funcs
+        self.directions = [1] * len(funcs) if directions is None else directions
+        self.error = (lambda approx, exact: np.abs(approx - exact)) if error is None else error
+        for degree in range(3, 13):
+            for per_octave in (1, 2, 4, 8, 16, 32, 64):
+                coef, err = self._fit(degree, per_octave)
+                if err <= tol:
+                    self.per_octave, self.n_panels, self.degree = per_octave, len(coef[0][0]), degree
+                    # (degree + 1, branches * panels), read row by row in __call__;
+                    # rows rescaled from s in [-1, 1] to y = s / (2 per_octave)
+                    self.coef = np.concatenate(coef, axis=1) * (2.0 * per_octave)**np.arange(degree + 1)[:, None]
+                    bits = int(np.log2(per_octave))
+                    self._shift = 52 - bits
+                    self._offset = (e_min - 1 + 1023) << bits
+                    return
+                # Halving the panels cuts the error by about 2**(degree + 1);
+                # stop once even 64 per octave cannot get there
+                if err * 2.0**(-(degree + 1) * np.log2(64 / per_octave)) > tol:
+                    break
+        raise ValueError(f"tolerance {tol:g} is not reachable in double precision")
+
+    def _fit(self, degree, per_octave):
+        """Coefficients per branch and the worst check-point error (inf if not monotone)"""
+        start = np.arange(self.n_octaves * per_octave) / per_octave
+
+        def where(s):
+            # v at local coordinate s in [-1, 1] of every panel
+            octaves = start + (s[:, None] + 1) / (2 * per_octave)
+            return np.ldexp(1 + octaves % 1, self.e_min - 1 + octaves.astype(int))
+
+        # Chebyshev-Lobatto nodes include both ends, so neighbouring panels
+        # agree where they meet and the table is continuous
+        nodes = np.cos(np.pi * np.arange(degree, -1, -1) / degree)
+        vander = np.vander(nodes, increasing=True)
+        v_check = where(self._CHECK)
+        coef, worst = [], 0.0
+        for f, direction in zip(self.funcs, self.directions):
+            c = np.linalg.solve(vander, f(where(nodes)))
+            approx = np.polynomial.polynomial.polyval(self._CHECK, c).T
+            exact = f(v_check)
+            err = self.error(approx, exact)
+            if not (np.all(np.isfinite(exact)) and np.all(direction * np.diff(approx, axis=0) >= 0)):
+                err = np.inf
+            coef.append(c)
+            worst = max(worst, np.max(err))
+        return coef, worst
+
+    def __call__(self, v, branch=None):
+        """Values at v and a mask of the points inside the table (others are garbage)"""
+        bits = np.ascontiguousarray(v, dtype=float).view(np.int64)
+        idx = bits >> self._shift
+        idx -= self._offset
+        # 0, negatives, inf and nan all land outside [0, n_panels)
+        inside = idx.view(np.uint64) < self.n_panels
+        if branch is not None:
+            idx += branch * self.n_panels
+        # The remaining mantissa bits under exponent 0 give 1 + (s + 1) / (2 per_octave)
+        y = ((bits & ((1 << self._shift) - 1)) | (1023 << 52)).view(np.float64)
+        y -= 1 + 0.5 / self.per_octave
+        r = np.take(self.coef[-1], idx, mode='clip')
+        for j in range(self.degree - 1, -1, -1):
+            r *= y
+            r += np.take(self.coef[j], idx, mode='clip')
+        return r, inside
+
+# Tables cover u and 1 - u down to 2**-60 and x between those quantiles;
+# anything beyond falls back to the closed forms
+_TABLE_TAIL = 2.0**-60
+
+def _blockwise(func, v, block=2**14):
+    """func over consecutive blocks of v, small enough that temporaries stay in cache"""
+    v = np.asarray(v, dtype=float)
+    flat = v.ravel()
+    out = np.empty(flat.shape)
+    for i in range(0, flat.size, block):
+        out[i:i+block] = func(flat[i:i+block])
+    out = out.reshape(v.shape)
+    return out[()] if out.ndim == 0 else out
+
+def _log_quantile_from_angles(t, t_c, k, alpha):
+    """log Q at lam = 1, finite even where Q itself underflows"""
+    log_odds = (np.log(t) - np.log(t_c)) / alpha
+    # log z = log log1p(exp(log_odds)), which is log_odds to rounding below -40
+    log_z = np.where(log_odds < -40, log_odds, np.log(np.logaddexp(0, log_odds)))
+    return log_z / k
+
+@lru_cache(maxsize=32)
+def _ppf_table(k, alpha, tol):
+    """log Q(u) at lam = 1 on octaves of u < 1/2 (branch 0) and of 1 - u < 1/2 (branch 1)"""
+    def log_ppf(u):
+        return _log_quantile_from_angles(np.arcsin(u), np.arccos(u), k, alpha)
+
+    def log_isf(q):
+        t_c = 2 * np.arcsin(np.sqrt(q / 2))
+        return _log_quantile_from_angles(np.pi/2 - t_c, t_c, k, alpha)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return _OctaveTable([log_ppf, log_isf], -59, -1, tol, directions=(1, -1))
+
+@lru_cache(maxsize=32)
+def _cdf_table(k, alpha, tol):
+    """logit F(x) at lam = 1, between the 2**-60 and 1 - 2**-60 quantiles"""
+    def logit_cdf(x):
+        funcs = stiiHLW_eval(x, 1.0, k, alpha, ("logcdf", "logsf"))
+        return funcs["logcdf"] - funcs["logsf"]
+    # An error d in logit F is a relative error (1 - F) d in F
+    relative = lambda approx, exact: np.abs(approx - exact) * expit(-exact)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        lo = np.frexp(max(stiiHLW_quantile(_TABLE_TAIL, 1.0, k, alpha), 1e-300))[1]
+        hi = np.frexp(stiiHLW_isf(_TABLE_TAIL, 1.0, k, alpha))[1]
+        return _OctaveTable([logit_cdf], lo, hi, tol, error=relative)
+
+
+class STIIHLW:
+    """Frozen STIIHL Weibull distribution with fixed (lam, k, alpha)
+
+    Mirrors the frozen ``scipy.stats.rv_continuous`` interface (pdf, cdf,
+    sf, ppf, isf, rvs, stats, moment, mean, var, std, median, interval,
+    expect, entropy, support) on the closed-form kernels, plus hazard,
+    cumhazard and the fused ``eval``. Moments, the median and the entropy
+    are computed once per instance and memoized. Moments and expectations
+    integrate over the quantile, E[g(X)] = int_0^1 g(Q(u)) du, so no
+    x-grid or truncation is involved.
+
+    ``ppf``, ``cdf`` and ``rvs`` accept ``tol`` to evaluate through a
+    piecewise-polynomial interpolant with relative error <= tol, 2-3x
+    faster per point than the closed forms. Interpolants are built at
+    lam = 1 and kept in an LRU cache keyed by (k, alpha, tol), so they
+    are shared across instances and lam. Building one takes tens of
+    milliseconds and pays off from about a million evaluations
+    (``benchmarks.bench_interpolant``).
+    """
+    __slots__ = ("lam", "k", "alpha", "_cache")
+
+    def __init__(self, lam, k, alpha):
+        if not (lam > 0 and k > 0 and alpha > 0):
+            raise ValueError("lam, k and alpha must all be positive")
+        self.lam = float(lam)
+        self.k = float(k)
+        self.alpha = float(alpha)
+        self._cache = {}
+
+    @property
+    def args(self):
+        """The parameters as a (lam, k, alpha) tuple"""
+        return (self.lam, self.k, self.alpha)
+
+    def __repr__(self):
+        return f"STIIHLW(lam={self.lam:g}, k={self.k:g}, alpha={self.alpha:g})"
+
+    def __eq__(self, other):
+        return isinstance(other, STIIHLW) and self.args == other.args
+
+    def __hash__(self):
+        return hash(self.args)
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def eval(self, x, which=STIIHLW_FUNCTIONS):
+        """Several functions at x in one pass; see ``stiiHLW_eval``"""
+        return stiiHLW_eval(x, *self.args, which)
+
+    def pdf(self, x):
+        return stiiHLW_pdf(x, *self.args)
+
+    def logpdf(self, x):
+        return stiiHLW_logpdf(x, *self.args)
+
+    def cdf(self, x, tol=None):
+        """CDF; with ``tol``, from a cached interpolant with relative error <= tol"""
+        if tol is None:
+            return stiiHLW_cdf(x, *self.args)
+        table = _cdf_table(self.k, self.alpha, float(tol))
+
+        def block(x):
+            logit, inside = table(x / self.lam)
+            F = expit(logit)
+            if not inside.all():
+                F[~inside] = stiiHLW_cdf(x[~inside], *self.args)
+            return F
+        return _blockwise(block, x)
+
+    def logcdf(self, x):
+        return stiiHLW_logcdf(x, *self.args)
+
+    def sf(self, x):
+        return stiiHLW_sf(x, *self.args)
+
+    def logsf(self, x):
+        return stiiHLW_logsf(x, *self.args)
+
+    def hazard(self, x):
+        return stiiHLW_hazard(x, *self.args)
+
+    def cumhazard(self, x):
+        return stiiHLW_cumhazard(x, *self.args)
+
+    def ppf(self, q, tol=None):
+        """Quantile; with ``tol``, from a cached interpolant with relative error <= tol"""
+        if tol is None:
+            return stiiHLW_quantile(q, *self.args)
+        table = _ppf_table(self.k, self.alpha, float(tol))
+
+        def block(q):
+            upper = q >= 0.5
+            log_x, inside = table(np.where(upper, 1 - q, q), upper)
+            x = self.lam * np.exp(log_x)
+            if not inside.all():
+                x[~inside] = stiiHLW_quantile(q[~inside], *self.args)
+            return x
+        return _blockwise(block, q)
+
+    def isf(self, q):
+        return stiiHLW_isf(q, *self.args)
+
+    def rvs(self, size=None, random_state=None, tol=None):
+        if tol is None:
+            return stiiHLW_rvs(*self.args, size=size, random_state=random_state)
+        return self.ppf(np.random.default_rng(random_state).random(size), tol)
+
+    def support(self):
+        return 0.0, np.inf
+
+    def interval(self, confidence):
+        """Equal-tailed interval containing ``confidence`` of the mass"""
+        tail = (1 - np.asarray(confidence, dtype=float)) / 2
+        return self.ppf(tail), self.isf(tail)
+
+    def median(self):
+        return self._memo("median", lambda: float(self.ppf(0.5)))
+
+    def _quantile_integral(self, func, lower=0.0, upper=1.0):
+        """int func(Q(u)) du over [lower, upper] by adaptive quadrature
+
+        The upper half runs over q = 1 - u through ``isf``, since nodes
+        within rounding of u = 1 would otherwise hit Q = inf.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            total = 0.0
+            if lower < 0.5:
+                total += quad(lambda u: func(self.ppf(u)), lower, min(upper, 0.5), limit=200)[0]
+            if upper > 0.5:
+                total += quad(lambda q: func(self.isf(q)), 1 - upper, 1 - max(lower, 0.5),
+                              limit=200)[0]
+            return total
+
+    def moment(self, order):
+        """Raw moment E[X**order]; see ``stiiHLW_moments``"""
+        return self._memo(("moment", int(order)),
+                          lambda: stiiHLW_moments(*self.args, orders=(order,))[0][0])
+
+    def stats(self, moments='mv'):
+        """Mean ('m'), variance ('v'), skewness ('s') and excess kurtosis ('k')"""
+        summary = self._memo("stats", lambda: stiiHLW_stats(*self.args))
+        names = {'m': 'mean', 'v': 'variance', 's': 'skewness', 'k': 'kurtosis'}
+        out = tuple(summary[names[m]] for m in moments)
+        return out[0] if len(out) == 1 else out
+
+    def mean(self):
+        return self.stats('m')
+
+    def var(self):
+        return self.stats('v')
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def entropy(self):
+        """Differential entropy -E[log f(X)]"""
+        return self._memo("entropy", lambda: self._quantile_integral(lambda x: -self.logpdf(x)))
+
+    def expect(self, func=None, lb=None, ub=None, conditional=False):
+        """E[func(X)], optionally over lb <= X <= ub (renormalized if conditional)"""
+        if func is None:
+            func = lambda x: x
+        lower = 0.0 if lb is None else float(self.cdf(lb))
+        upper = 1.0 if ub is None else float(self.cdf(ub))
+        value = self._quantile_integral(func, lower, upper)
+        return value / (upper - lower) if conditional else value
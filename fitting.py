@@ -0,0 +1,666 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+import numpy as np
+from scipy.stats import qmc
+
+from accumulators import MomentAccumulator, QuantileSketch
+from distributions import (
+    FitResult, fit_stiiHLW, stiiHLW_initial_guess, stiiHLW_loglik, _check_support,
+    _maximize_loglik, _to_log_params
+)
+
+
+class BootstrapResult:
+    """Bootstrap replicates of the STIIHL Weibull MLE
+
+    ``replicates`` is an (n_boot, 3) array of (lam, k, alpha) estimates in
+    replicate order; replicates whose fit failed, or that were cancelled,
+    are nan. ``fit`` is the full-sample FitResult used as the warm start.
+    """
+
+    def __init__(self, fit, replicates, completed, cancelled=False):
+        self.fit = fit
+        self.replicates = replicates
+        self.completed = completed
+        self.cancelled = cancelled
+
+    def percentile_intervals(self, level=0.95):
+        """Percentile intervals, as a (3, 2) array of [lower, upper] rows"""
+        tail = (1 - level) / 2 * 100
+        return np.nanpercentile(self.replicates, [tail, 100 - tail], axis=0).T
+
+    @property
+    def standard_errors(self):
+        """Bootstrap standard errors of (lam, k, alpha)"""
+        return np.nanstd(self.replicates, axis=0, ddof=1)
+
+
+# Per-process view of the base sample, attached once by the pool initializer
+_shared = {}
+
+
+def _attach_shared(name, shape, dtype):
+    """Pool initializer: map the shared-memory base sample into this worker"""
+    shm = shared_memory.SharedMemory(name=name)
+    _shared['shm'] = shm
+    _shared['data'] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _bootstrap_chunk(seed_seq, n_rep, x0, method, data=None):
+    """Fit ``n_rep`` resamples drawn with the chunk's own RNG stream"""
+    if data is None:
+        data = _shared['data']
+    rng = np.random.default_rng(seed_seq)
+    out = np.full((n_rep, 3), np.nan)
+    for i in range(n_rep):
+        sample = data[rng.integers(0, len(data), len(data))]
+        fit = fit_stiiHLW(sample, method=method, x0=x0)
+        if fit.success:
+            out[i] = fit.params
+    return out
+
+
+def bootstrap_stiiHLW(data, n_boot=1000, seed=None, n_workers=None, chunk_size=25,
+                      method='L-BFGS-B', progress=None, cancel=None):
+    """Nonparametric bootstrap of the MLE across a process pool
+
+    Replicates are grouped into chunks of ``chunk_size``, each with its own
+    stream spawned from ``SeedSequence(seed)``, so results depend on the
+    seed and chunk size but not on ``n_workers``. Every replicate is
+    warm-started from the full-sample MLE. The base sample is placed in
+    shared memory once and mapped by each worker instead of being pickled
+    per task. ``progress(done, total)`` is called as chunks finish; if
+    ``cancel()`` returns True, pending chunks are dropped and the partial
+    result is returned. ``n_workers=1`` runs in-process.
+    """
+    data = np.ascontiguousarray(data, dtype=float)
+    fit = fit_stiiHLW(data, method=method)
+    x0 = tuple(fit.params)
+
+    sizes = [min(chunk_size, n_boot - start) for start in range(0, n_boot, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    offsets = np.cumsum([0] + sizes[:-1])
+    replicates = np.full((n_boot, 3), np.nan)
+    completed = 0
+    cancelled = False
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    if n_workers == 1:
+        for offset, size, ss in zip(offsets, sizes, seeds):
+            if cancel is not None and cancel():
+                cancelled = True
+                break
+            replicates[offset:offset + size] = _bootstrap_chunk(ss, size, x0, method, data)
+            completed += size
+            if progress is not None:
+                progress(completed, n_boot)
+        return BootstrapResult(fit, replicates, completed, cancelled)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    try:
+        np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach_shared,
+                                 initargs=(shm.name, data.shape, data.dtype)) as pool:
+            pending = {
+                pool.submit(_bootstrap_chunk, ss, size, x0, method): (offset, size)
+                for offset, size, ss in zip(offsets, sizes, seeds)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset, size = pending.pop(future)
+                    replicates[offset:offset + size] = future.result()
+                    completed += size
+                if progress is not None:
+                    progress(completed, n_boot)
+                if cancel is not None and pending and cancel():
+                    for future in pending:
+                        future.cancel()
+                    cancelled = True
+                    break
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return BootstrapResult(fit, replicates, completed, cancelled)
+
+
+def _multistart_fit(start, method, data=None):
+    """One local fit from ``start``"""
+    if data is None:
+        data = _shared['data']
+    return fit_stiiHLW(data, method=method, x0=start)
+
+
+def fit_stiiHLW_multistart(data, n_starts=16, seed=None, n_workers=None, agree=3,
+                           spread=10.0, tol=1e-3, method='L-BFGS-B'):
+    """Multi-start MLE over a process pool, stopping once starts agree
+
+    The data-driven start is joined by ``n_starts - 1`` Latin-hypercube
+    starts, log-uniform within a factor of ``spread`` of it in each
+    parameter. Local fits run on a pool sharing the sample as in
+    ``bootstrap_stiiHLW``. Fits whose log-likelihoods are within ``tol``
+    count as one optimum, so stops spread along a flat (k, alpha) ridge
+    agree; once ``agree`` successful fits land on the best optimum so far,
+    the remaining starts are cancelled. Which starts ran can then depend
+    on completion order; ``n_workers=1`` runs in-process, in start order.
+
+    Returns the best fit as a FitResult whose ``details`` hold every local
+    optimum found (``optima``, ``optima_loglik`` and how many starts
+    reached each, ``optima_count``, best first) and the number of fits run.
+    """
+    data = np.ascontiguousarray(data, dtype=float)
+    center = np.log(stiiHLW_initial_guess(data))
+    unit = qmc.LatinHypercube(d=3, seed=np.random.default_rng(seed)).random(n_starts - 1)
+    starts = np.exp(center + (2 * unit - 1) * np.log(spread))
+    starts = np.vstack([np.exp(center), starts])
+
+    optima = []
+
+    def record(fit):
+        """Add a local fit to its optimum; True once the best one has enough agreement"""
+        if not fit.success or not np.isfinite(fit.loglik):
+            return False
+        for opt in optima:
+            if abs(fit.loglik - opt['fit'].loglik) <= tol:
+                opt['count'] += 1
+                if fit.loglik > opt['fit'].loglik:
+                    opt['fit'] = fit
+                break
+        else:
+            optima.append({'fit': fit, 'count': 1})
+        return max(optima, key=lambda opt: opt['fit'].loglik)['count'] >= agree
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    n_run = 0
+    stopped = False
+    if n_workers == 1:
+        for start in starts:
+            n_run += 1
+            if record(_multistart_fit(start, method, data)):
+                stopped = n_run < n_starts
+                break
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        try:
+            np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach_shared,
+                                     initargs=(shm.name, data.shape, data.dtype)) as pool:
+                pending = {pool.submit(_multistart_fit, start, method) for start in starts}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    n_run += len(done)
+                    if any([record(future.result()) for future in done]) and pending:
+                        for future in pending:
+                            future.cancel()
+                        stopped = True
+                        break
+        finally:
+            shm.close()
+            shm.unlink()
+
+    if not optima:
+        # Every start failed: report the data-driven start's fit
+        return fit_stiiHLW(data, method=method)
+
+    optima.sort(key=lambda opt: -opt['fit'].loglik)
+    fit = optima[0]['fit']
+    fit.details = {
+        'optima': np.array([opt['fit'].params for opt in optima]),
+        'optima_loglik': np.array([opt['fit'].loglik for opt in optima]),
+        'optima_count': np.array([opt['count'] for opt in optima]),
+        'n_run': n_run,
+        'stopped_early': stopped,
+    }
+    return fit
+
+
+class BatchFitResult:
+    """Per-dataset results of a batched STIIHL Weibull fit
+
+    ``params`` is (n_datasets, 3); ``loglik``, ``converged`` and ``nit``
+    are per dataset.
+    """
+
+    def __init__(self, params, loglik, converged, nit):
+        self.params = params
+        self.loglik = loglik
+        self.converged = converged
+        self.nit = nit
+
+
+def _pad_datasets(data, mask):
+    """Stack datasets into a (B, n) array plus a boolean observed-mask"""
+    if isinstance(data, np.ndarray) and data.ndim == 2:
+        data = np.asarray(data, dtype=float)
+        mask = np.isfinite(data) if mask is None else np.asarray(mask, dtype=bool)
+    else:
+        rows = [np.asarray(d, dtype=float).ravel() for d in data]
+        width = max(len(r) for r in rows)
+        padded = np.full((len(rows), width), np.nan)
+        for i, r in enumerate(rows):
+            padded[i, :len(r)] = r
+        data = padded
+        mask = np.isfinite(data)
+    # Masked slots get a harmless placeholder; they carry zero weight
+    return np.where(mask, data, 1.0), mask
+
+
+def fit_batch_stiiHLW(data, mask=None, x0=None, max_iter=100, xtol=1e-8, ftol=1e-12):
+    """Fit many datasets at once with a lockstep damped Newton iteration
+
+    ``data`` is a (datasets x observations) array, optionally with a
+    boolean ``mask`` of observed entries (nan entries are masked too), or a
+    list of 1-D arrays of different lengths. Every dataset takes a
+    Levenberg-Marquardt step on log-parameters per iteration, using the
+    analytic score and Hessian evaluated for all active datasets in one
+    vectorized pass; datasets drop out as they converge. As in
+    ``fit_stiiHLW``, each dataset starts from ``stiiHLW_initial_guess``
+    (or ``x0``), is divided by its starting lam and is fitted over
+    unconstrained log-parameters; results are mapped back to the original
+    units.
+    """
+    x, mask = _pad_datasets(data, mask)
+    _check_support(x[mask])
+    weights = mask.astype(float)
+    n_obs = weights.sum(axis=1)
+    B = x.shape[0]
+
+    if x0 is None:
+        theta = np.array([stiiHLW_initial_guess(row[m]) for row, m in zip(x, mask)])
+    else:
+        theta = np.broadcast_to(np.asarray(x0, dtype=float), (B, 3)).copy()
+    lam0 = theta[:, 0].copy()
+    x = x / lam0[:, None]
+    eta = np.log(theta / np.column_stack([lam0, np.ones(B), np.ones(B)]))
+
+    def evaluate(idx, eta_idx):
+        """log-likelihood, score and Hessian in log-parameters for datasets idx"""
+        th = np.exp(eta_idx)
+        ll, grad, hess = stiiHLW_loglik(x[idx], th[:, :1], th[:, 1:2], th[:, 2:],
+                                        deriv=2, weights=weights[idx])
+        grad, hess = _to_log_params(th, grad.T, np.moveaxis(hess, -1, 0))
+        return ll, grad, hess
+
+    ll, grad, hess = evaluate(np.arange(B), eta)
+    damping = np.full(B, 1e-3)
+    converged = np.zeros(B, dtype=bool)
+    nit = np.zeros(B, dtype=int)
+    active = np.flatnonzero(np.isfinite(ll))
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        nit[active] += 1
+
+        # Marquardt-scaled step on -ll
+        info = -hess[active]
+        scale = np.abs(info[:, np.arange(3), np.arange(3)]) + 1e-12
+        system = info + (damping[active, None] * scale)[:, :, None] * np.eye(3)
+        step = np.linalg.solve(system, grad[active][:, :, None])[:, :, 0]
+        step = np.clip(step, -2.0, 2.0)
+        trial = eta[active] + step
+
+        ll_t, grad_t, hess_t = evaluate(active, trial)
+        better = np.isfinite(ll_t) & (ll_t >= ll[active])
+
+        moved = np.max(np.abs(trial - eta[active]), axis=1)
+        gain = ll_t - ll[active]
+        done = better & ((moved < xtol) | (gain <= ftol * (np.abs(ll[active]) + 1)))
+
+        accept = active[better]
+        eta[accept] = trial[better]
+        ll[accept], grad[accept], hess[accept] = ll_t[better], grad_t[better], hess_t[better]
+        damping[accept] /= 3
+        damping[active[~better]] *= 4
+
+        # A step that cannot improve even under heavy damping has stalled at the optimum
+        stalled = ~better & (damping[active] > 1e10)
+        converged[active[done | stalled]] = True
+        active = active[~(done | stalled)]
+
+    params = np.exp(eta)
+    params[:, 0] *= lam0
+    return BatchFitResult(params, ll - n_obs * np.log(lam0), converged, nit)
+
+
+def _chunk_source(source, chunk_size):
+    """Normalize a data source to a zero-argument function yielding chunks
+
+    ``source`` may be a path to a ``.npy`` file (memory-mapped), an array or
+    memmap (sliced lazily), a callable returning a fresh chunk iterator, or
+    a re-iterable collection of chunks. One-shot iterators are rejected
+    because every likelihood evaluation makes a full pass.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = np.load(source, mmap_mode='r')
+    if isinstance(source, np.ndarray):
+        flat = source.reshape(-1)
+        def chunks():
+            for start in range(0, len(flat), chunk_size):
+                yield flat[start:start + chunk_size]
+        return chunks
+    if callable(source):
+        return source
+    if iter(source) is source:
+        raise TypeError("a one-shot iterator cannot be re-read; "
+                        "pass a callable that returns a fresh chunk iterator")
+    return lambda: iter(source)
+
+
+def _map_chunks(func, chunks, executor, max_pending):
+    """Yield func(chunk) for each chunk, keeping at most max_pending in flight"""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(func, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def chunked_loglik(source, lam, k, alpha, deriv=0, chunk_size=262144, n_threads=None,
+                   executor=None):
+    """Log-likelihood (and score/Hessian) accumulated chunk by chunk
+
+    Chunks are evaluated on a thread pool (NumPy ufuncs release the GIL)
+    with at most two chunks per thread in flight, so peak memory is bounded
+    by the chunk size rather than the dataset size. Returns the same
+    tuple as ``stiiHLW_loglik``.
+    """
+    chunks = _chunk_source(source, chunk_size)
+    n_threads = n_threads or os.cpu_count() or 1
+
+    def evaluate(chunk):
+        result = stiiHLW_loglik(np.asarray(chunk, dtype=float), lam, k, alpha, deriv=deriv)
+        return result if deriv else (result,)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(n_threads)
+    try:
+        total = None
+        for part in _map_chunks(evaluate, chunks(), executor, 2 * n_threads):
+            total = part if total is None else tuple(a + b for a, b in zip(total, part))
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return total if deriv else total[0]
+
+
+def fit_stiiHLW_chunked(source, method='L-BFGS-B', x0=None, chunk_size=262144, n_threads=None):
+    """Maximum likelihood fit over data that need not fit in memory
+
+    ``source`` is a ``.npy`` path (memory-mapped), an array or memmap, or a
+    callable returning a fresh iterator of chunks. The log-likelihood and
+    its analytic derivatives are accumulated per chunk on a shared thread
+    pool. A first pass checks that every value lies in (0, inf), raising
+    ValueError as ``fit_stiiHLW`` does, counts the data and keeps an
+    evenly strided sample of about 256 values per chunk for
+    ``stiiHLW_initial_guess``.
+    """
+    chunks = _chunk_source(source, chunk_size)
+    n_threads = n_threads or os.cpu_count() or 1
+
+    def thin(chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        _check_support(chunk)
+        return len(chunk), chunk[::max(1, len(chunk) // 256)].copy()
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        sizes, sample = zip(*_map_chunks(thin, chunks(), executor, 2 * n_threads))
+        if x0 is None:
+            x0 = stiiHLW_initial_guess(np.concatenate(sample))
+
+        def loglik(params, deriv):
+            return chunked_loglik(chunks, *params, deriv=deriv, chunk_size=chunk_size,
+                                  n_threads=n_threads, executor=executor)
+
+        # The log-parameter search is relative to x0, so it is already
+        # unit-free; rescaling would cost an extra copy of every chunk
+        return _maximize_loglik(loglik, x0, sum(sizes), method=method)
+
+
+class OnlineSTIIHLW:
+    """Incremental STIIHL Weibull MLE for continuously arriving data
+
+    Keeps a running quadratic model of the total log-likelihood in
+    log-parameters: each batch adds its analytic score and Hessian at the
+    current estimate, and the estimate moves to the model's maximizer
+    (a recursive Newton step), so ``partial_fit`` costs O(batch). Until
+    ``min_count`` observations have arrived and the model is concave,
+    batches are kept and each one triggers an exact fit of all of them,
+    so a handful of early points cannot start the recursion far from the
+    MLE. A batch whose score or Hessian is not finite is left out of the
+    model and counted in ``n_rejected``. With ``polish_every=m`` the
+    batches are also retained and every m-th batch triggers a full-history
+    fit, warm-started from the running estimate, that resets the model;
+    if that fit fails the model is kept and the batch is counted as
+    rejected (it stays in the history for the next polish).
+
+    ``loglik`` is the model's value at the current estimate: exact right
+    after an exact fit, otherwise a second-order approximation of the
+    log-likelihood of all data seen (``loglik_exact`` tells which).
+    ``moments`` and ``quantiles`` summarize the data seen so far in
+    constant memory, for checking the fit against the observations.
+    """
+
+    def __init__(self, x0=None, polish_every=None, max_step=1.0, min_count=200):
+        self.x0 = x0
+        self.polish_every = polish_every
+        self.max_step = max_step
+        self.min_count = min_count
+        self.params = None
+        self.loglik = np.nan
+        self.loglik_exact = False
+        self.n_seen = 0
+        self.n_batches = 0
+        self.n_rejected = 0
+        self._curvature = None
+        self._offset = None
+        self._constant = None
+        self._warm = False
+        self._history = []
+        self.moments = MomentAccumulator()
+        self.quantiles = QuantileSketch()
+
+    def _reset_model(self, data):
+        """Rebuild the quadratic model from an exact fit on ``data``; False if that fails"""
+        fit = fit_stiiHLW(data, x0=self.x0 if self.params is None else tuple(self.params))
+        if not fit.success:
+            return False
+        ll, grad, hess = stiiHLW_loglik(data, *fit.params, deriv=2)
+        grad_eta, hess_eta = _to_log_params(fit.params, grad, hess)
+        eta = np.log(fit.params)
+        self.params = fit.params
+        self._curvature = hess_eta
+        self._offset = grad_eta - hess_eta @ eta
+        self._constant = ll - grad_eta @ eta + eta @ hess_eta @ eta / 2
+        self.loglik = ll
+        self.loglik_exact = True
+        return True
+
+    def partial_fit(self, batch):
+        """Update the estimate with a new batch of observations"""
+        batch = np.asarray(batch, dtype=float).ravel()
+        if batch.size == 0:
+            return self
+        self.n_seen += batch.size
+        self.n_batches += 1
+        self.moments.update(batch)
+        self.quantiles.update(batch)
+        if self._history is not None:
+            self._history.append(batch)
+
+        if not self._warm:
+            if self._reset_model(np.concatenate(self._history)) and self.n_seen >= self.min_count:
+                try:
+                    np.linalg.cholesky(-self._curvature)
+                    self._warm = True
+                    if not self.polish_every:
+                        self._history = None
+                except np.linalg.LinAlgError:
+                    pass
+            return self
+
+        if self.polish_every and self.n_batches % self.polish_every == 0:
+            if not self._reset_model(np.concatenate(self._history)):
+                self.n_rejected += 1
+            return self
+
+        eta = np.log(self.params)
+        ll, grad, hess = stiiHLW_loglik(batch, *self.params, deriv=2)
+        grad_eta, hess_eta = _to_log_params(self.params, grad, hess)
+        if not (np.isfinite(ll) and np.all(np.isfinite(grad_eta)) and np.all(np.isfinite(hess_eta))):
+            self.n_rejected += 1
+            return self
+        self._curvature = self._curvature + hess_eta
+        self._offset = self._offset + grad_eta - hess_eta @ eta
+        self._constant = self._constant + ll - grad_eta @ eta + eta @ hess_eta @ eta / 2
+
+        # Maximizer of the accumulated model; fall back to a gradient step if it is not concave
+        try:
+            np.linalg.cholesky(-self._curvature)
+            target = np.linalg.solve(-self._curvature, self._offset)
+        except np.linalg.LinAlgError:
+            model_grad = self._offset + self._curvature @ eta
+            target = eta + model_grad / max(np.abs(np.diag(self._curvature)).max(), 1.0)
+        eta = eta + np.clip(target - eta, -self.max_step, self.max_step)
+        self.params = np.exp(eta)
+        self.loglik = self._constant + self._offset @ eta + eta @ self._curvature @ eta / 2
+        self.loglik_exact = False
+        return self
+
+    def result(self):
+        """Current estimate as a FitResult, with information from the running model
+
+        Its ``loglik`` is approximate unless ``loglik_exact``; see the class.
+        Raises RuntimeError until a first fit has succeeded.
+        """
+        if self._curvature is None:
+            raise RuntimeError("no data fitted yet")
+        information = -self._curvature / np.outer(self.params, self.params)
+        message = '' if self.loglik_exact else 'loglik from the running quadratic model'
+        return FitResult(self.params, self.loglik, information, success=True,
+                         nit=self.n_batches, message=message)
+
+
+def stratified_subsample(data, sample_size, random_state=None, tail_boost=10.0):
+    """Stratified Poisson subsample with inverse-probability weights
+
+    Strata are bounded by quantiles of a small random pilot, finer in the
+    tails. Each observation is kept independently at its stratum's rate,
+    with the extreme strata sampled ``tail_boost`` times more densely so
+    the tails are well represented; the returned weights (1/rate) make the
+    weighted log-likelihood unbiased for the full-data one.
+    """
+    data = np.asarray(data, dtype=float)
+    n = data.size
+    rng = np.random.default_rng(random_state)
+    base = min(1.0, sample_size / n)
+    if base >= 1.0:
+        return data, np.ones(n)
+
+    probs = np.array([0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999])
+    pilot = data[rng.integers(0, n, min(n, 20000))]
+    edges = np.quantile(pilot, probs)
+    stratum = np.searchsorted(edges, data)
+
+    # Boost the outermost strata (below 1% and above 99%), then renormalize to the budget
+    boost = np.ones(len(probs) + 1)
+    boost[[0, 1, -2, -1]] = tail_boost
+    shares = np.diff(np.concatenate([[0.0], probs, [1.0]]))
+    rates = np.minimum(1.0, base * boost / np.sum(shares * boost))
+
+    keep = rng.random(n) < rates[stratum]
+    return data[keep], 1.0 / rates[stratum[keep]]
+
+
+def fit_stiiHLW_subsample(data, sample_size=100_000, max_newton=5, tol=0.1,
+                          random_state=None, n_threads=None):
+    """Fit on a stratified subsample, then polish with full-data Newton steps
+
+    The weighted subsample fit lands within sampling error of the full MLE;
+    each polish step is one chunked full-data pass of the analytic score
+    and Hessian. Polishing stops at the first evaluated point whose Newton
+    decrement, the squared length of the remaining step in standard-error
+    units, is below ``tol``: that point is returned as it stands, with the
+    log-likelihood and information of its own pass, so no pass is spent
+    on verification. A pass that loses likelihood halves the previous
+    step instead. Where minus the Hessian is not positive definite the
+    step is Levenberg-Marquardt damped until it is, and such a point never
+    counts as converged. If ``max_newton`` passes run out first, the best
+    evaluated point is returned with ``success=False``.
+
+    ``details`` records the subsample estimate, how far the polish moved
+    it (relative, per parameter), the number of full-data passes, the
+    time spent in each phase and the estimated speed-up over
+    ``fit_stiiHLW`` on the full data, taken as one full-data pass per
+    optimizer iteration of the subsample fit plus the final Hessian
+    pass, at the measured cost of a polish pass.
+    """
+    data = np.asarray(data, dtype=float)
+    start = time.perf_counter()
+    sample, weights = stratified_subsample(data, sample_size, random_state)
+    pilot = fit_stiiHLW(sample, weights=weights)
+    t_subsample = time.perf_counter() - start
+
+    theta = pilot.params.copy()
+    step = np.zeros(3)
+    best = None
+    converged = False
+    passes = 0
+    with ThreadPoolExecutor(n_threads or os.cpu_count() or 1) as executor:
+        while passes < max_newton:
+            ll, grad, hess = chunked_loglik(data, *theta, deriv=2, executor=executor)
+            passes += 1
+            if best is not None and not ll >= best[1]:
+                step = step / 2
+                theta = best[0] + step
+                continue
+            if not (np.isfinite(ll) and np.all(np.isfinite(grad)) and np.all(np.isfinite(hess))):
+                break
+            best = theta, ll, grad, hess
+            # Newton step if -hess is positive definite, otherwise the least damping that makes it so
+            info = -hess
+            ridge = np.diag(np.abs(np.diag(info)) + 1e-12)
+            damping = 0.0
+            while damping < 1e12:
+                try:
+                    np.linalg.cholesky(info + damping * ridge)
+                    break
+                except np.linalg.LinAlgError:
+                    damping = max(1e-3, damping * 10)
+            step = np.linalg.solve(info + damping * ridge, grad)
+            if damping == 0 and grad @ step < tol:
+                converged = True
+                break
+            # Stay inside the parameter space
+            while np.any(theta + step <= 0):
+                step = step / 2
+            theta = theta + step
+
+    if best is None:
+        theta, ll, hess = pilot.params, np.nan, np.full((3, 3), np.nan)
+    else:
+        theta, ll, grad, hess = best
+    t_polish = time.perf_counter() - start - t_subsample
+    full_estimate = (pilot.nit + 1) * t_polish / passes if passes else np.nan
+    details = {
+        'subsample_size': sample.size,
+        'subsample_params': pilot.params,
+        'moved': np.abs(theta - pilot.params) / pilot.params,
+        'full_passes': passes,
+        'subsample_time': t_subsample,
+        'polish_time': t_polish,
+        'speedup': full_estimate / (t_subsample + t_polish),
+    }
+    return FitResult(theta, ll, -hess, success=pilot.success and converged,
+                     nit=pilot.nit + passes, details=details)
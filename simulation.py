@@ -0,0 +1,386 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from scipy.stats import qmc
+
+from accumulators import MomentAccumulator, QuantileSketch
+from distributions import stiiHLW_isf, stiiHLW_quantile, stiiHLW_rvs, stiiHLW_sf, stiiHLW_stats
+
+SAMPLING_METHODS = ("standard", "antithetic", "sobol", "halton", "control")
+
+# Control-variate mode: replicate means are regressed on the exceedances of
+# these quantiles, whose probabilities 1 - p are known exactly
+_CONTROL_LEVELS = np.arange(1, 10) / 10
+
+
+class SimulationStats:
+    """One-pass, mergeable summaries of a Monte Carlo study
+
+    ``draws`` holds the moments of every draw pooled; ``means`` and
+    ``stds`` the moments of the per-replicate means and stds, with
+    ``mean_quantiles`` a sketch of the means; ``exceedance`` and
+    ``exceedance_quantiles`` hold one accumulator and sketch per threshold
+    over the per-replicate exceedance fractions. Stats of disjoint blocks
+    merge into the stats of their union.
+    """
+
+    def __init__(self, n_thresholds=0):
+        self.draws = MomentAccumulator()
+        self.means = MomentAccumulator()
+        self.mean_quantiles = QuantileSketch()
+        self.stds = MomentAccumulator()
+        self.exceedance = [MomentAccumulator() for _ in range(n_thresholds)]
+        self.exceedance_quantiles = [QuantileSketch() for _ in range(n_thresholds)]
+
+    def update(self, draws, means, stds, exceedance):
+        self.draws.update(draws)
+        self.means.update(means)
+        self.mean_quantiles.update(means)
+        self.stds.update(stds)
+        for acc, sketch, fractions in zip(self.exceedance, self.exceedance_quantiles, exceedance):
+            acc.update(fractions)
+            sketch.update(fractions)
+        return self
+
+    def merge(self, other):
+        self.draws.merge(other.draws)
+        self.means.merge(other.means)
+        self.mean_quantiles.merge(other.mean_quantiles)
+        self.stds.merge(other.stds)
+        for mine, theirs in zip(self.exceedance + self.exceedance_quantiles,
+                                other.exceedance + other.exceedance_quantiles):
+            mine.merge(theirs)
+        return self
+
+
+class SimulationResult:
+    """Per-replicate summaries of a Monte Carlo study
+
+    ``means`` and ``stds`` (ddof=0) have one entry per replicate;
+    ``percentiles`` is (len(percentile_levels), n_simulations) and
+    ``exceedance`` is (len(thresholds), n_simulations), the fraction of
+    each replicate above each threshold. ``traces`` holds the first
+    ``retain`` replicates' raw draws, (retain, n_samples). The
+    per-replicate arrays are None when the study was run with
+    ``keep_replicates=False``; ``stats`` (a SimulationStats) is always
+    filled. ``sampling`` is the variance-reduction mode the draws used.
+    """
+
+    def __init__(self, params, n_simulations, n_samples, means, stds, percentile_levels,
+                 percentiles, thresholds, exceedance, traces, stats, sampling="standard"):
+        self.params = params
+        self.n_simulations = n_simulations
+        self.n_samples = n_samples
+        self.means = means
+        self.stds = stds
+        self.percentile_levels = percentile_levels
+        self.percentiles = percentiles
+        self.thresholds = thresholds
+        self.exceedance = exceedance
+        self.traces = traces
+        self.stats = stats
+        self.sampling = sampling
+
+    def __repr__(self):
+        return (f"SimulationResult(n_simulations={self.n_simulations}, "
+                f"n_samples={self.n_samples}, params={self.params})")
+
+    def variance_reduction(self):
+        """Variance-reduction factors of the replicate means and exceedance fractions
+
+        Each factor is the variance plain Monte Carlo would give a
+        replicate of ``n_samples`` draws, known exactly (sigma**2 / n for
+        the mean, p (1 - p) / n for the fraction above a threshold), over
+        the variance observed across replicates; i.e. how many times fewer
+        draws reach the same interval width. About 1 for "standard"
+        sampling. Returns a dict with "mean" and "exceedance", the latter
+        aligned with ``thresholds`` (nan where p is 0 or 1).
+        """
+        n = self.n_samples
+        plain_mean = stiiHLW_stats(*self.params)["variance"] / n
+        p = stiiHLW_sf(self.thresholds, *self.params)
+        plain_exceedance = p * (1 - p) / n
+        observed = np.array([acc.var(ddof=1) for acc in self.stats.exceedance])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            exceedance = np.where(plain_exceedance > 0, plain_exceedance / observed, np.nan)
+            return {"mean": plain_mean / self.stats.means.var(ddof=1), "exceedance": exceedance}
+
+    def risk_curve(self, level=0.95):
+        """RiskCurve over ``thresholds``, from the run's accumulators"""
+        order = np.argsort(self.thresholds)
+        tail = (1 - level) / 2
+        quantiles = [self.stats.exceedance_quantiles[i] for i in order]
+        bounds = np.array([sketch.quantile([tail, 1 - tail]) for sketch in quantiles]).reshape(-1, 2)
+        return RiskCurve(self.thresholds[order], stiiHLW_sf(self.thresholds[order], *self.params),
+                         np.array([self.stats.exceedance[i].mean for i in order]),
+                         bounds[:, 0], bounds[:, 1], level, quantiles)
+
+
+class RiskCurve:
+    """Exceedance probability against threshold, simulated and exact
+
+    ``thresholds`` is increasing; ``exact`` is P(X > t) from stiiHLW_sf,
+    ``mean`` the simulated probability (mean of the per-replicate
+    fractions) and ``lower``/``upper`` the central ``level`` range of the
+    per-replicate fractions. ``quantiles[i]`` is the sketch of the
+    fractions at ``thresholds[i]``.
+    """
+
+    def __init__(self, thresholds, exact, mean, lower, upper, level, quantiles):
+        self.thresholds = thresholds
+        self.exact = exact
+        self.mean = mean
+        self.lower = lower
+        self.upper = upper
+        self.level = level
+        self.quantiles = quantiles
+
+    def __repr__(self):
+        return f"RiskCurve(n_thresholds={len(self.thresholds)}, level={self.level})"
+
+    def index(self, threshold):
+        """Position of the tabulated threshold nearest to ``threshold``"""
+        i = np.clip(np.searchsorted(self.thresholds, threshold), 1, len(self.thresholds) - 1)
+        return np.where(threshold - self.thresholds[i - 1] <= self.thresholds[i] - threshold, i - 1, i)
+
+    def at(self, threshold):
+        """Exact and simulated exceedance at the nearest tabulated threshold, as a dict"""
+        i = int(self.index(threshold)) if len(self.thresholds) > 1 else 0
+        return {"threshold": self.thresholds[i], "exact": self.exact[i], "mean": self.mean[i],
+                "lower": self.lower[i], "upper": self.upper[i]}
+
+
+def exceedance_fractions(samples, thresholds, presorted=False):
+    """Fraction of each row of ``samples`` strictly above each threshold
+
+    Every value is binned once against the sorted thresholds and the
+    per-row bin counts are summed from the top, so the cost barely grows
+    with the number of thresholds. Binning is much faster when each row is
+    sorted; pass ``presorted=True`` if it already is. Returns an array of
+    shape (len(thresholds), n_rows); a 1-D sample counts as one row.
+    """
+    samples = np.atleast_2d(np.asarray(samples, dtype=float))
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+    if not presorted:
+        samples = np.sort(samples, axis=1)
+    n_rows, n = samples.shape
+    order = np.argsort(thresholds)
+    n_bins = len(thresholds) + 1
+    # Bin b holds the values with exactly b thresholds below them
+    bins = np.searchsorted(thresholds[order], samples, side="left")
+    bins += n_bins * np.arange(n_rows)[:, None]
+    counts = np.bincount(bins.ravel(), minlength=n_rows * n_bins).reshape(n_rows, n_bins)
+    above = np.cumsum(counts[:, :0:-1], axis=1)[:, ::-1]
+    out = np.empty((len(thresholds), n_rows))
+    out[order] = above.T / n
+    return out
+
+
+def _sorted_percentiles(rows, levels):
+    """np.percentile (linear) of each already-sorted row, as (len(levels), n_rows)"""
+    position = np.asarray(levels) / 100 * (rows.shape[1] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, rows.shape[1] - 1)
+    frac = position - lower
+    return (rows[:, lower] * (1 - frac) + rows[:, upper] * frac).T
+
+
+def _block_rows(n_samples, max_block_bytes):
+    """Replicates per block so that one block of float64 draws fits the budget"""
+    return max(1, int(max_block_bytes) // (8 * int(n_samples)))
+
+
+def _draw_block(rng, n_rep, n_samples, params, sampling):
+    """(n_rep, n_samples) draws by inverse transform of the mode's uniforms
+
+    "antithetic" pairs every u with 1 - u (through the isf, which keeps the
+    upper tail exact). "sobol" and "halton" build one unscrambled
+    one-dimensional point set per block and randomize it per replicate,
+    "sobol" by a random digital shift (XOR of the 52-bit fractions, which
+    keeps the net structure) and "halton" by a random shift modulo 1, so
+    replicates stay independent and their spread still measures the error.
+    """
+    if sampling in ("sobol", "halton"):
+        engine = qmc.Sobol if sampling == "sobol" else qmc.Halton
+        with warnings.catch_warnings():
+            # Sobol balance warnings for sizes that are not powers of 2
+            warnings.simplefilter("ignore")
+            base = engine(d=1, scramble=False).random(n_samples)[:, 0]
+        if sampling == "sobol":
+            bits = np.uint64(2**52)
+            shift = rng.integers(0, bits, size=(n_rep, 1), dtype=np.uint64)
+            u = ((base * 2.0**52).astype(np.uint64) ^ shift) * 2.0**-52
+        else:
+            u = (base + rng.random((n_rep, 1))) % 1.0
+        return stiiHLW_quantile(u, *params)
+    if sampling == "antithetic":
+        u = rng.random((n_rep, (n_samples + 1) // 2))
+        return np.hstack([stiiHLW_quantile(u, *params), stiiHLW_isf(u, *params)])[:, :n_samples]
+    return stiiHLW_rvs(*params, size=(n_rep, n_samples), random_state=rng)
+
+
+def _control_variates(draws, means, stds, exceedance, controls):
+    """Control-variate estimates of the replicate means and exceedance fractions
+
+    ``draws`` are sorted rows and ``controls`` holds the exact mean and the
+    quantiles at _CONTROL_LEVELS. Each fraction above a threshold is
+    corrected by the sample mean's error against the exact mean; each
+    mean by the errors of the fractions above the quantiles, whose exact
+    values are 1 - _CONTROL_LEVELS. Coefficients come from the
+    within-replicate covariances pooled over the block, since fitting them
+    per replicate biases small replicates. Every covariance needed follows
+    from the fractions and the sums of the draws above each threshold,
+    read off a reversed cumulative sum of the sorted rows.
+    """
+    exact_mean, quantiles = controls
+    n_rep, n = draws.shape
+    tail_sums = np.zeros((n_rep, n + 1))
+    tail_sums[:, :n] = np.cumsum(draws[:, ::-1], axis=1)[:, ::-1]
+
+    def tail_means(fractions):
+        """Mean of x * 1{x > t} per replicate, for fractions (n_thresholds, n_rep)"""
+        first = n - np.rint(fractions * n).astype(int)
+        return np.take_along_axis(tail_sums, first.T, axis=1).T / n
+
+    variance = np.mean(stds**2)
+    cov = np.mean(tail_means(exceedance) - exceedance * means, axis=1)
+    beta = cov / variance if variance > 0 else np.zeros_like(cov)
+    exceedance = exceedance - beta[:, None] * (means - exact_mean)
+
+    p = exceedance_fractions(draws, quantiles, presorted=True)
+    cov_xy = np.mean(tail_means(p) - p * means, axis=1)
+    # cov(1{x > q_i}, 1{x > q_j}) = p_max(i, j) - p_i p_j, and p falls as q rises
+    cov_yy = np.mean(np.minimum(p[:, None], p[None, :]) - p[:, None] * p[None, :], axis=2)
+    beta = np.linalg.pinv(cov_yy, hermitian=True) @ cov_xy
+    means = means - beta @ (p - (1 - _CONTROL_LEVELS)[:, None])
+    return means, exceedance
+
+
+def _simulate_block(seed_seq, n_rep, n_samples, params, percentile_levels, thresholds,
+                    n_trace=0, keep_replicates=True, sampling="standard", controls=None):
+    """Draw ``n_rep`` replicates with the block's own stream and reduce them
+
+    Returns the block's SimulationStats, its per-replicate summaries
+    (means, stds, percentiles, exceedance; None unless ``keep_replicates``)
+    and the raw draws of its first ``n_trace`` replicates. Only these
+    reductions leave a worker process.
+    """
+    rng = np.random.default_rng(seed_seq)
+    draws = _draw_block(rng, n_rep, n_samples, params, sampling)
+    means = draws.mean(axis=1)
+    stds = draws.std(axis=1)
+    trace = draws[:n_trace].copy()
+    # One in-place sort per replicate serves every percentile and threshold
+    draws.sort(axis=1)
+    exceedance = exceedance_fractions(draws, thresholds, presorted=True)
+    if sampling == "control":
+        means, exceedance = _control_variates(draws, means, stds, exceedance, controls)
+    stats = SimulationStats(len(thresholds)).update(draws, means, stds, exceedance)
+    summary = None
+    if keep_replicates:
+        summary = means, stds, _sorted_percentiles(draws, percentile_levels), exceedance
+    return stats, summary, trace
+
+
+def simulate_stiiHLW(lam, k, alpha, n_simulations, n_samples,
+                     percentile_levels=(5, 25, 50, 75, 95), thresholds=(), retain=0,
+                     seed=None, max_block_bytes=4 * 2**20, keep_replicates=True, n_workers=1,
+                     sampling="standard", progress=None):
+    """Monte Carlo study of ``n_simulations`` samples of size ``n_samples``
+
+    Replicates are drawn in blocks of at most ``max_block_bytes`` of
+    draws with the vectorized sampler, and every block is reduced straight
+    to per-replicate mean, std, percentiles and exceedance fractions for
+    ``thresholds`` before the next is drawn. Peak memory is therefore a
+    few blocks' worth of temporaries plus the summaries, independent of
+    n_simulations * n_samples; only the first ``retain`` replicates' raw
+    draws are kept. Each block
+    has its own stream spawned from ``SeedSequence(seed)``.
+
+    Every block also feeds mergeable accumulators (``result.stats``), so
+    moments and quantiles of the replicate summaries are available in one
+    pass; with ``keep_replicates=False`` the per-replicate arrays are not
+    stored at all and memory is constant in n_simulations.
+
+    Blocks run on a pool of ``n_workers`` processes (None for all cores,
+    1 in-process); workers send back only their block's reductions. The
+    block layout depends on ``n_samples`` and ``max_block_bytes`` alone
+    and block stats are merged in block order, so a given seed gives
+    bit-identical results for any ``n_workers``.
+
+    ``sampling`` is one of SAMPLING_METHODS: "standard" draws i.i.d.;
+    "antithetic" pairs each uniform with its mirror; "sobol" and "halton"
+    use randomized quasi-Monte Carlo points per replicate; "control"
+    draws i.i.d. but reports control-variate estimates of the replicate
+    means and exceedance fractions (percentiles and stds are as drawn).
+    ``result.variance_reduction()`` gives the factor each mode achieved.
+    ``progress(done, total)`` is called after every block.
+    """
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"sampling must be one of {SAMPLING_METHODS}, got {sampling!r}")
+    params = (float(lam), float(k), float(alpha))
+    controls = None
+    if sampling == "control":
+        controls = (stiiHLW_stats(*params)["mean"], stiiHLW_quantile(_CONTROL_LEVELS, *params))
+    percentile_levels = np.atleast_1d(np.asarray(percentile_levels, dtype=float))
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+    rows = _block_rows(n_samples, max_block_bytes)
+    sizes = [min(rows, n_simulations - start) for start in range(0, n_simulations, rows)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    offsets = np.cumsum([0] + sizes[:-1])
+
+    stats = SimulationStats(len(thresholds))
+    if keep_replicates:
+        means = np.empty(n_simulations)
+        stds = np.empty(n_simulations)
+        percentiles = np.empty((len(percentile_levels), n_simulations))
+        exceedance = np.empty((len(thresholds), n_simulations))
+    else:
+        means = stds = percentiles = exceedance = None
+    retain = min(int(retain), n_simulations)
+    traces = np.empty((retain, n_samples))
+    tasks = [(ss, size, n_samples, params, percentile_levels, thresholds,
+              int(min(size, max(retain - offset, 0))), keep_replicates, sampling, controls)
+             for offset, size, ss in zip(offsets, sizes, seeds)]
+
+    # Block stats that finished ahead of an earlier block wait here, so the
+    # merge order (and hence every floating-point sum) is the block order
+    finished = {}
+    merged = 0
+    completed = 0
+
+    def collect(index, block_stats, summary, trace):
+        nonlocal merged, completed
+        offset, size = offsets[index], sizes[index]
+        if summary is not None:
+            block = slice(offset, offset + size)
+            means[block], stds[block], percentiles[:, block], exceedance[:, block] = summary
+        traces[offset:offset + len(trace)] = trace
+        finished[index] = block_stats
+        while merged in finished:
+            stats.merge(finished.pop(merged))
+            merged += 1
+        completed += size
+        if progress is not None:
+            progress(completed, n_simulations)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(tasks))
+
+    if n_workers <= 1:
+        for index, task in enumerate(tasks):
+            collect(index, *_simulate_block(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            pending = {pool.submit(_simulate_block, *task): index
+                       for index, task in enumerate(tasks)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(pending.pop(future), *future.result())
+
+    return SimulationResult(params, n_simulations, n_samples, means, stds, percentile_levels,
+                            percentiles, thresholds, exceedance, traces, stats, sampling)
@@ -0,0 +1,127 @@
+"""Precomputed STIIHL Weibull summaries over a (k, alpha) grid
+
+lam only rescales X, so every summary is stored at lam = 1 and scaled on
+lookup: location measures by lam, the variance by lam**2, and the
+standardized moments and hazard shape not at all. Queries inside the
+grid are answered by local cubic interpolation in (log k, log alpha);
+outside it, or without a table file, they fall back to exact
+computation. Rebuild the shipped table with ``python tables.py``.
+"""
+import os
+import time
+from functools import lru_cache
+import numpy as np
+from distributions import HAZARD_SHAPES, stiiHLW_hazard_shape, stiiHLW_mode, stiiHLW_quantile, stiiHLW_stats
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stiihlw_table.npz")
+
+# Interpolated fields, each stored through a transform that keeps it smooth
+# in (log k, log alpha): logs of the scales, asinh of the skewness (huge for
+# small k) and the log of the non-excess kurtosis, which is always >= 1.
+# The median has a closed form and is not tabulated.
+_FIELDS = ("log_mean", "log_std", "asinh_skewness", "log_kurtosis", "mode_ratio")
+
+def _exact_summary(lam, k, alpha):
+    stats = stiiHLW_stats(lam, k, alpha)
+    summary = {name: float(stats[name]) for name in ("mean", "variance", "std", "skewness", "kurtosis")}
+    summary["median"] = float(stiiHLW_quantile(0.5, lam, k, alpha))
+    summary["mode"] = stiiHLW_mode(lam, k, alpha)
+    summary["hazard_shape"] = stiiHLW_hazard_shape(k, alpha)
+    return summary
+
+def build_summary_table(path=TABLE_PATH, k_range=(0.1, 20.0), alpha_range=(0.1, 20.0), n=121):
+    """Tabulate unit-scale summaries on an n x n grid, geometric in k and alpha
+
+    Takes a few minutes; the result is written with ``np.savez_compressed``.
+    """
+    log_k = np.linspace(np.log(k_range[0]), np.log(k_range[1]), n)
+    log_alpha = np.linspace(np.log(alpha_range[0]), np.log(alpha_range[1]), n)
+    values = np.empty((len(_FIELDS), n, n))
+    shape = np.empty((n, n), dtype=np.int8)
+    for i, k in enumerate(np.exp(log_k)):
+        for j, alpha in enumerate(np.exp(log_alpha)):
+            s = _exact_summary(1.0, k, alpha)
+            values[:, i, j] = (np.log(s["mean"]), np.log(s["std"]), np.arcsinh(s["skewness"]),
+                               np.log(s["kurtosis"] + 3), s["mode"] / s["median"])
+            shape[i, j] = HAZARD_SHAPES.index(s["hazard_shape"])
+    np.savez_compressed(path, log_k=log_k, log_alpha=log_alpha, hazard_shape=shape,
+                        **dict(zip(_FIELDS, values)))
+
+@lru_cache(maxsize=4)
+def load_summary_table(path=TABLE_PATH):
+    """The table as a dict of arrays, or None if the file does not exist"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        table = {name: data[name] for name in data.files}
+    table["values"] = np.stack([table[name] for name in _FIELDS])
+    return table
+
+def _cubic_stencil(s, n):
+    """First of four grid nodes around fractional index s, and their Lagrange weights"""
+    first = min(max(int(s) - 1, 0), n - 4)
+    t = s - first
+    weights = np.array([-(t - 1) * (t - 2) * (t - 3) / 6, t * (t - 2) * (t - 3) / 2,
+                        -t * (t - 1) * (t - 3) / 2, t * (t - 1) * (t - 2) / 6])
+    return first, weights
+
+def stiiHLW_summary(lam, k, alpha, table=None):
+    """Mean, variance, std, skewness, excess kurtosis, median, mode and hazard shape
+
+    Interpolated from the precomputed table when (k, alpha) lies on it
+    (relative error typically 1e-7 and at most a few 1e-4, in tens of
+    microseconds); computed exactly otherwise. Returns a dict; ``hazard_shape``
+    is one of HAZARD_SHAPES. The mode and hazard shape are only
+    interpolated where the surrounding grid nodes agree on whether the
+    mode is at 0 and on the shape; across those boundaries they are
+    computed exactly.
+    """
+    table = load_summary_table() if table is None else table
+    if table is None:
+        return _exact_summary(lam, k, alpha)
+    log_k, log_alpha = table["log_k"], table["log_alpha"]
+    n_k, n_alpha = len(log_k), len(log_alpha)
+    s = (np.log(k) - log_k[0]) / (log_k[1] - log_k[0])
+    t = (np.log(alpha) - log_alpha[0]) / (log_alpha[1] - log_alpha[0])
+    if not (0 <= s <= n_k - 1 and 0 <= t <= n_alpha - 1):
+        return _exact_summary(lam, k, alpha)
+
+    i, wk = _cubic_stencil(s, n_k)
+    j, wa = _cubic_stencil(t, n_alpha)
+    patch = table["values"][:, i:i+4, j:j+4]
+    mean, std, skew, kurt, mode_ratio = patch @ wa @ wk
+    std = lam * np.exp(std)
+    # F = 1/2 at T = 1/3, i.e. G/(1 - G) = 2**(-1/alpha)
+    median = lam * np.log1p(2**(-1/alpha))**(1/k)
+
+    # The mode leaves 0 with a kink at k*alpha = 1 and jumps where the
+    # density turns bimodal; a stencil with large second differences
+    # straddles one of those and is not trusted
+    ratios = patch[-1]
+    if (table["mode_ratio"][int(s):int(s)+2, int(t):int(t)+2] == 0).all():
+        mode = 0.0
+    elif max(np.abs(np.diff(ratios, 2, axis=0)).max(), np.abs(np.diff(ratios, 2, axis=1)).max()) < 0.02:
+        mode = mode_ratio * median
+    else:
+        mode = stiiHLW_mode(lam, k, alpha)
+    cell = table["hazard_shape"][int(s):int(s)+2, int(t):int(t)+2]
+    if (cell == cell.flat[0]).all():
+        shape = HAZARD_SHAPES[cell.flat[0]]
+    else:
+        shape = stiiHLW_hazard_shape(k, alpha)
+    return {
+        "mean": lam * np.exp(mean),
+        "variance": std**2,
+        "std": std,
+        "skewness": np.sinh(skew),
+        "kurtosis": np.exp(kurt) - 3,
+        "median": median,
+        "mode": mode,
+        "hazard_shape": shape,
+    }
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    build_summary_table()
+    print(f"wrote {TABLE_PATH} in {time.perf_counter() - start:.0f} s")